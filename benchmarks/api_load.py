@@ -0,0 +1,390 @@
+"""Throughput and p50/p95/p99 latency of the API's hot paths.
+
+Boots src.main:app against a freshly seeded database (a throwaway SQLite
+file unless --db-url is given) with the in-memory Redis stand-in and no
+rate limits, runs every scenario at each concurrency level and writes the
+numbers to benchmarks/results/<commit>.json for comparing commits:
+
+    python benchmarks/api_load.py --levels 1 10 50 --requests 500
+    python benchmarks/api_load.py --compare 2adca75
+
+Requests go through httpx.ASGITransport by default, which measures the
+app without sockets. --server runs uvicorn instead, so HTTP parsing and
+worker processes are included. Needs httpx, plus uvicorn for --server.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import count
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+SCENARIOS = ("list", "search", "popular", "detail", "login", "me")
+SEARCH_TERMS = ("chicken", "beef", "cake", "soup", "pie")
+PASSWORD = "test123"  # what Seeder gives every user
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def configure(db_url: str):
+    """Settings are read at import time, so this runs before any src import"""
+    os.environ["DB_URL"] = db_url
+    os.environ["REDIS_BACKEND"] = "memory"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["QUERY_PROFILING"] = "false"
+    for name, value in (
+        ("JWT_SECRET", "benchmark"),
+        ("JWT_ALGORITHM", "HS256"),
+        ("ACCESS_TOKEN_EXPIRE_MINUTES", "60"),
+        ("REFRESH_TOKEN_EXPIRE_MINUTES", "600"),
+        ("CLD_NAME", "benchmark"),
+        ("CLD_API_KEY", "0"),
+        ("CLD_API_SECRET", "benchmark"),
+        ("SEED_USER_PASSWORD", PASSWORD),
+    ):
+        os.environ.setdefault(name, value)
+
+
+async def seed(create: bool):
+    """Seed recipes and users, plus a few favorites so /popular has an order"""
+    from sqlalchemy import insert, select
+
+    from src.database import Base, Recipe, User, UserFavoriteRecipe
+    from src.database.db import sessionmanager
+    from src.database.seed import Seeder
+    from src.repo.recipe_repo import RecipeRepo
+
+    if create:
+        async with sessionmanager.session() as session:
+            await session.run_sync(
+                lambda s: Base.metadata.create_all(s.connection())
+            )
+            await session.commit()
+    await Seeder(bulk=True).run()
+
+    async with sessionmanager.session() as session:
+        users = (await session.execute(select(User.id))).scalars().all()
+        recipes = (await session.execute(select(Recipe.id))).scalars().all()
+        # deterministic: user i likes every (i + 2)th recipe
+        rows = [
+            {"userId": user_id, "recipeId": recipe_id}
+            for i, user_id in enumerate(users)
+            for recipe_id in recipes[:: i + 2]
+        ]
+        if rows:
+            await session.execute(insert(UserFavoriteRecipe), rows)
+        await RecipeRepo(session).reconcile_favorites_count()
+        await session.commit()
+
+
+async def fixtures() -> dict:
+    """Ids and a login to build requests from"""
+    from sqlalchemy import select
+
+    from src.database import Recipe, User
+    from src.database.db import sessionmanager
+
+    async with sessionmanager.session() as session:
+        recipe_ids = (
+            (await session.execute(select(Recipe.id).order_by(Recipe.id)))
+            .scalars()
+            .all()
+        )
+        username = (
+            await session.execute(select(User.name).order_by(User.id).limit(1))
+        ).scalar_one()
+    if not recipe_ids:
+        raise SystemExit("❌ No recipes in the database, run with --seed")
+    return {"recipe_ids": recipe_ids, "username": username}
+
+
+def scenario_request(name: str, i: int, fx: dict) -> tuple:
+    """(method, url, keyword args) of the i-th request of a scenario"""
+    if name == "list":
+        return "GET", "/api/recipe/", {"params": {"limit": 20}}
+    if name == "search":
+        term = SEARCH_TERMS[i % len(SEARCH_TERMS)]
+        return "GET", "/api/recipe/search/", {"params": {"q": term}}
+    if name == "popular":
+        return "GET", "/api/recipe/popular", {"params": {"limit": 20}}
+    if name == "detail":
+        ids = fx["recipe_ids"]
+        # a fixed stride walks the whole table instead of one hot row
+        return "GET", f"/api/recipe/{ids[i * 7 % len(ids)]}", {}
+    if name == "login":
+        data = {"username": fx["username"], "password": PASSWORD}
+        return "POST", "/api/auth/login", {"data": data}
+    if name == "me":
+        return "GET", "/api/users/me", {"headers": fx["auth"]}
+    raise ValueError(f"Unknown scenario {name}")
+
+
+def percentile(quantiles: list, p: int) -> float:
+    return round(quantiles[p - 1] * 1000, 2)
+
+
+async def run_level(client, name: str, fx: dict, concurrency: int, total: int, warmup: int):
+    for i in range(warmup):
+        method, url, kwargs = scenario_request(name, i, fx)
+        await client.request(method, url, **kwargs)
+
+    latencies: list = []
+    statuses: Counter = Counter()
+    counter = count()
+
+    async def user():
+        while (i := next(counter)) < total:
+            method, url, kwargs = scenario_request(name, i, fx)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": percentile(quantiles, 50),
+        "p95_ms": percentile(quantiles, 95),
+        "p99_ms": percentile(quantiles, 99),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "errors": errors,
+        "statuses": dict(statuses),
+    }
+
+
+async def drive(client, args, fx: dict) -> list:
+    response = await client.post(
+        "/api/auth/login", data={"username": fx["username"], "password": PASSWORD}
+    )
+    response.raise_for_status()
+    fx["auth"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    results = []
+    for concurrency in args.levels:
+        for name in args.scenarios:
+            result = await run_level(
+                client, name, fx, concurrency, args.requests, args.warmup
+            )
+            results.append(result)
+            print(
+                f"  {name:<8} c={concurrency:<4} {result['rps']:8.1f} req/s"
+                f"  p50 {result['p50_ms']:7.2f}  p95 {result['p95_ms']:7.2f}"
+                f"  p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+            )
+    return results
+
+
+async def run_in_process(args, fx: dict) -> list:
+    from src.main import app
+
+    limits = httpx.Limits(max_connections=None)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", limits=limits
+        ) as client:
+            return await drive(client, args, fx)
+
+
+async def wait_until_up(client, process, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("❌ uvicorn exited during startup")
+        try:
+            if (await client.get("/api/healthchecker")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("❌ uvicorn did not come up in time")
+
+
+async def run_server(args, fx: dict) -> list:
+    from src.database.db import sessionmanager
+
+    await sessionmanager.close()  # the server opens its own connections
+    port = str(args.port)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.main:app",
+            "--host", "127.0.0.1", "--port", port,
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=BASE_DIR,
+        env=os.environ.copy(),
+    )
+    limits = httpx.Limits(max_connections=max(args.levels))
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+        ) as client:
+            await wait_until_up(client, process)
+            return await drive(client, args, fx)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def bench(args, seed_first: bool, create: bool):
+    if seed_first:
+        await seed(create)
+    fx = await fixtures()
+    runner = run_server if args.server else run_in_process
+    return fx, await runner(args, fx)
+
+
+def git(*command: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *command], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def result_path(ref: str, server: bool) -> str:
+    """A results file, or the one saved for a commit"""
+    if os.path.exists(ref):
+        return ref
+    sha = git("rev-parse", "--short", ref) or ref
+    return os.path.join(RESULTS_DIR, f"{sha}{'-server' if server else ''}.json")
+
+
+def save(report: dict, output: str | None) -> str:
+    if output is None:
+        name = report["commit"] or "unknown"
+        name += "-dirty" if report["dirty"] else ""
+        # uvicorn numbers are not comparable with in-process ones
+        name += "-server" if report["config"]["transport"] != "asgi" else ""
+        output = os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    return output
+
+
+def _change(old: float, new: float) -> str:
+    return f"{(new - old) / old * 100:+6.1f}%" if old else "    n/a"
+
+
+def compare(baseline: dict, report: dict):
+    print(f"\n📊 {baseline['commit']} → {report['commit']}")
+    if baseline["config"]["transport"] != report["config"]["transport"]:
+        print("⚠️ Different transports, the numbers are not comparable")
+    old = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    matched = [
+        (old[key], result)
+        for result in report["results"]
+        if (key := (result["scenario"], result["concurrency"])) in old
+    ]
+    if not matched:
+        print("⚠️ No scenario and concurrency level in common")
+    for before, result in matched:
+        print(
+            f"  {result['scenario']:<8} c={result['concurrency']:<4}"
+            f" req/s {before['rps']:8.1f} → {result['rps']:8.1f} "
+            f"{_change(before['rps'], result['rps'])}"
+            f"  p95 {before['p95_ms']:7.2f} → {result['p95_ms']:7.2f} ms "
+            f"{_change(before['p95_ms'], result['p95_ms'])}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=300, help="per scenario and level")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests first")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument(
+        "--db-url",
+        help="existing database, e.g. local Postgres (default: a temporary SQLite file)",
+    )
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="wipe and reseed --db-url; the temporary SQLite file is always seeded",
+    )
+    parser.add_argument("--server", action="store_true", help="go through uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", help="results file or commit to diff against")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if httpx is None:
+        raise SystemExit("❌ The load test needs httpx: pip install httpx")
+    if args.requests < 2:
+        raise SystemExit("❌ --requests must be at least 2 for percentiles")
+
+    baseline = None
+    if args.compare:
+        path = result_path(args.compare, args.server)
+        if not os.path.exists(path):
+            raise SystemExit(f"❌ No results at {path}")
+        with open(path) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{tmp}/foodies_bench.db"
+        configure(db_url)
+        transport = f"uvicorn x{args.workers}" if args.server else "asgi"
+        print(f"🚀 {len(args.scenarios)} scenarios, {args.requests} requests each, via {transport}")
+        fx, results = asyncio.run(
+            bench(
+                args,
+                seed_first=args.db_url is None or args.seed,
+                create=args.db_url is None,
+            )
+        )
+
+    report = {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "config": {
+            "database": db_url.split(":", 1)[0],
+            "transport": transport,
+            "levels": args.levels,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "recipes": len(fx["recipe_ids"]),
+        },
+        "results": results,
+    }
+    print(f"💾 Saved {save(report, args.output)}")
+    if baseline is not None:
+        compare(baseline, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""get_current_user / get_current_principal with and without the JWT cache.
+
+Needs a seeded settings.DB_URL; run with REDIS_BACKEND=memory to measure the
+token path rather than the network:
+
+    REDIS_BACKEND=memory python benchmarks/jwt_verify.py --rounds 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from sqlalchemy import select
+
+from src.database.db import sessionmanager
+from src.database.redis_client import redis_manager
+from src.database.user_models import User
+from src.services.auth_service import (
+    access_claims,
+    create_access_token,
+    get_current_principal,
+    get_current_user,
+    verified_tokens,
+)
+
+
+async def measure(dependency, token: str, db, rounds: int) -> float:
+    await dependency(token, db)  # fills the user cache
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await dependency(token, db)
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+async def main(rounds: int):
+    maxsize = verified_tokens.maxsize
+    try:
+        async with sessionmanager.session() as db:
+            user = (await db.execute(select(User).limit(1))).scalar_one()
+            token = await create_access_token(access_claims(user))
+
+            print(f"📊 {rounds} calls with one access token")
+            for dependency in (get_current_user, get_current_principal):
+                verified_tokens.maxsize = 0  # every set() is evicted at once
+                verified_tokens.invalidate()
+                cold = await measure(dependency, token, db, rounds)
+                verified_tokens.maxsize = maxsize
+                warm = await measure(dependency, token, db, rounds)
+                print(
+                    f"  {dependency.__name__:<22} {cold:7.1f} µs uncached"
+                    f"  {warm:7.1f} µs cached  ({cold / warm:.1f}x)"
+                )
+    finally:
+        verified_tokens.maxsize = maxsize
+        await sessionmanager.close()
+        await redis_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
@@ -0,0 +1,76 @@
+"""ORM entities vs column rows for a 100-item recipe page.
+
+Runs against settings.DB_URL, which must already be seeded
+(`python src/database/seed.py --bulk`):
+
+    python benchmarks/list_rows.py --rounds 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from sqlalchemy import select
+
+from src.database.db import sessionmanager
+from src.database.recipe_models import Recipe
+from src.repo.recipe_repo import RecipeRepo
+from src.schemas.recipe import RecipeResponse
+
+
+async def orm_page(limit: int):
+    # the list endpoints before the lean read path
+    async with sessionmanager.session() as session:
+        result = await session.execute(select(Recipe).order_by(Recipe.id).limit(limit))
+        return [RecipeResponse.model_validate(r) for r in result.scalars().all()]
+
+
+async def row_page(limit: int):
+    async with sessionmanager.session() as session:
+        return await RecipeRepo(session).get_all_recipes(0, limit)
+
+
+async def measure(page, rounds: int, limit: int) -> dict:
+    await page(limit)  # warm the pool and the statement caches
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await page(limit)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    await page(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ms_per_page": elapsed / rounds * 1000, "peak_kib": peak / 1024}
+
+
+async def main(rounds: int, limit: int):
+    try:
+        results = {
+            "orm": await measure(orm_page, rounds, limit),
+            "rows": await measure(row_page, rounds, limit),
+        }
+    finally:
+        await sessionmanager.close()
+
+    print(f"📊 {rounds} rounds of {limit}-item pages")
+    for name, r in results.items():
+        print(f"  {name:<5} {r['ms_per_page']:8.3f} ms/page  {r['peak_kib']:9.1f} KiB peak")
+    speedup = results["orm"]["ms_per_page"] / results["rows"]["ms_per_page"]
+    print(f"✅ rows are {speedup:.2f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.limit))
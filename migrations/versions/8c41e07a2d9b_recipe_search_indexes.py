@@ -0,0 +1,56 @@
+"""Recipe search indexes
+
+Revision ID: 8c41e07a2d9b
+Revises: 247091dd8281
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e07a2d9b'
+down_revision: Union[str, None] = '247091dd8281'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FK indexes used by the search semi-joins and the /my listing
+    op.create_index(op.f('ix_recipes_ownerId'), 'recipes', ['ownerId'], unique=False)
+    op.create_index(op.f('ix_recipes_categoryId'), 'recipes', ['categoryId'], unique=False)
+    op.create_index(op.f('ix_recipes_areaId'), 'recipes', ['areaId'], unique=False)
+    op.create_index(op.f('ix_recipeIngredients_ingredientId'), 'recipeIngredients', ['ingredientId'], unique=False)
+
+    # Postgres only: trigram indexes for ILIKE '%term%' on the taxonomy names
+    # and a tsvector expression index for the free-text `q` search. The
+    # expression has to match src/repo/recipe_search.py:recipe_document.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX ix_categories_name_trgm ON categories USING gin (name gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_areas_name_trgm ON areas USING gin (name gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_ingredients_name_trgm ON ingredients USING gin (name gin_trgm_ops)')
+    op.execute(
+        "CREATE INDEX ix_recipes_search_document ON recipes USING gin "
+        "(to_tsvector('english'::regconfig, title || ' ' || description || ' ' || instructions))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_recipes_search_document')
+        op.execute('DROP INDEX IF EXISTS ix_ingredients_name_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_areas_name_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_categories_name_trgm')
+
+    op.drop_index(op.f('ix_recipeIngredients_ingredientId'), table_name='recipeIngredients')
+    op.drop_index(op.f('ix_recipes_areaId'), table_name='recipes')
+    op.drop_index(op.f('ix_recipes_categoryId'), table_name='recipes')
+    op.drop_index(op.f('ix_recipes_ownerId'), table_name='recipes')
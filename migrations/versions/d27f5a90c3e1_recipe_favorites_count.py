@@ -0,0 +1,34 @@
+"""Recipe favorites count
+
+Revision ID: d27f5a90c3e1
+Revises: 8c41e07a2d9b
+Create Date: 2026-10-18 11:03:12.450917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27f5a90c3e1'
+down_revision: Union[str, None] = '8c41e07a2d9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('recipes', sa.Column('favorites_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        'UPDATE recipes SET favorites_count = ('
+        'SELECT count(*) FROM "userFavoriteRecipes" f WHERE f."recipeId" = recipes.id)'
+    )
+    op.create_index('ix_recipes_popularity', 'recipes', [sa.text('favorites_count DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipes_popularity', table_name='recipes')
+    op.drop_column('recipes', 'favorites_count')
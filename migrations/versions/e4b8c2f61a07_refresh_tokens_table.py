@@ -0,0 +1,39 @@
+"""Refresh tokens table
+
+Revision ID: e4b8c2f61a07
+Revises: d27f5a90c3e1
+Create Date: 2026-10-18 13:21:05.637512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c2f61a07'
+down_revision: Union[str, None] = 'd27f5a90c3e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_tokens',
+    sa.Column('jti', sa.String(length=32), nullable=False),
+    sa.Column('userId', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['userId'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index(op.f('ix_refresh_tokens_userId'), 'refresh_tokens', ['userId'], unique=False)
+    # sessions issued before this revision have to log in again
+    op.drop_column('users', 'refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('users', sa.Column('refresh_token', sa.VARCHAR(length=255), autoincrement=False, nullable=True))
+    op.drop_index(op.f('ix_refresh_tokens_userId'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,48 @@
+"""Recipe search vector column
+
+Revision ID: f1a9d3c7b254
+Revises: e4b8c2f61a07
+Create Date: 2026-10-18 16:02:47.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9d3c7b254'
+down_revision: Union[str, None] = 'e4b8c2f61a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: store the tsvector so ts_rank_cd reads it instead of
+    # re-running to_tsvector for every matching row. Replaces the expression
+    # index from 8c41e07a2d9b; src/repo/recipe_search.py:SEARCH_VECTOR.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE recipes ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS "
+        "(to_tsvector('english'::regconfig, title || ' ' || description || ' ' || instructions)) STORED"
+    )
+    op.execute('CREATE INDEX ix_recipes_search_vector ON recipes USING gin (search_vector)')
+    op.execute('DROP INDEX IF EXISTS ix_recipes_search_document')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "CREATE INDEX ix_recipes_search_document ON recipes USING gin "
+        "(to_tsvector('english'::regconfig, title || ' ' || description || ' ' || instructions))"
+    )
+    op.execute('DROP INDEX IF EXISTS ix_recipes_search_vector')
+    op.execute('ALTER TABLE recipes DROP COLUMN search_vector')
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from src.schemas.taxonomy import AreaResponse
 
-from src.database.db import get_db
+from src.database.db import get_read_db
 from src.services.areas_service import AreaService
+from src.services.http_cache import conditional_json
 
 
 router = APIRouter(prefix="/areas", tags=["areas"])
 
 
 @router.get("/areas", response_model=List[AreaResponse])
-async def get_areas(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
+async def get_areas(
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db),
+):
 
     areas_service = AreaService(db)
-    areas = await areas_service.get_areas(skip, limit)
+    areas = await areas_service.get_areas_json(skip, limit)
 
-    return areas
+    return conditional_json(request, areas)
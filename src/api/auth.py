@@ -9,20 +9,20 @@ from src.schemas.token import TokenRefreshRequest
 from src.services.user_service import UserService
 from src.services.auth_service import (
     Hash,
+    access_claims,
     create_access_token,
-    create_refresh_token,
-    verify_refresh_token,
+    issue_refresh_token,
+    consume_refresh_token,
     oath2scheme,
 )
+from src.services.token_store import RefreshTokenStore
 from src.config.config import settings
 from src.schemas.token import Token
 from src.schemas.user import Message
 from fastapi.security import OAuth2PasswordBearer
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from src.services.rate_limiter import limiter
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 # User register
@@ -50,7 +50,7 @@ async def register_user(
                 detail="User with this name is already exists",
             )
 
-    user_data.password = Hash().get_pass_hash(user_data.password)
+    user_data.password = await Hash().get_pass_hash_async(user_data.password)
     new_user = await user_service.create_user(user_data)
 
     return new_user
@@ -66,7 +66,9 @@ async def login_user(
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
 
-    if not user or not Hash().verify_pass(form_data.password, user.hashed_password):
+    if not user or not await Hash().verify_pass_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Wrong login or password",
@@ -74,10 +76,8 @@ async def login_user(
         )
 
     # Generate JWT
-    access_token = await create_access_token(data={"sub": user.name})
-    refresh_token = await create_refresh_token(data={"sub": user.name})
-    user.refresh_token = refresh_token
-    await db.commit()
+    access_token = await create_access_token(data=access_claims(user))
+    refresh_token = await issue_refresh_token(user, RefreshTokenStore(db))
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -88,17 +88,19 @@ async def login_user(
 @router.post("/refresh-token", response_model=Token)
 async def new_token(request: TokenRefreshRequest, db: Session = Depends(get_db)):
 
-    user = await verify_refresh_token(request.refresh_token, db)
+    # rotation: the presented token is retired and replaced by a new one
+    store = RefreshTokenStore(db)
+    user = await consume_refresh_token(request.refresh_token, store)
 
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
-    new_access_token = await create_access_token(data={"sub": user.name})
+    new_access_token = await create_access_token(data=access_claims(user))
     return {
         "access_token": new_access_token,
-        "refresh_token": request.refresh_token,
+        "refresh_token": await issue_refresh_token(user, store),
         "token_type": "bearer",
     }
 
@@ -108,7 +110,8 @@ async def logout_user(
     refresh_token: str = Depends(oath2scheme), db: Session = Depends(get_db)
 ):
 
-    user = await verify_refresh_token(refresh_token, db)
+    # ends this session only, the user's other devices stay logged in
+    user = await consume_refresh_token(refresh_token, RefreshTokenStore(db))
 
     if not user:
         raise HTTPException(
@@ -117,7 +120,4 @@ async def logout_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_service = UserService(db)
-    await user_service.user_logout(user)
-
     return {"message": "Logged out successfully"}
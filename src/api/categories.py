@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from src.database.db import get_db
+from src.database.db import get_read_db
 from src.schemas.taxonomy import CategoryResponse
 from src.services.categories_service import CategoryService
+from src.services.http_cache import conditional_json
 
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -12,8 +13,11 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("/categories", response_model=List[CategoryResponse])
 async def get_categories(
-    skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db),
 ):
     cat_service = CategoryService(db)
-    categories = await cat_service.get_categories(skip, limit)
-    return categories
+    categories = await cat_service.get_categories_json(skip, limit)
+    return conditional_json(request, categories)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from src.schemas.ingridients import IngredientResponse
 
-from src.database.db import get_db
+from src.database.db import get_read_db
 from src.services.ingredients_service import IngredService
+from src.services.http_cache import conditional_json
 
 
 router = APIRouter(prefix="/ingredients", tags=["ingredients"])
@@ -12,9 +13,12 @@ router = APIRouter(prefix="/ingredients", tags=["ingredients"])
 
 @router.get("/ingredients", response_model=List[IngredientResponse])
 async def get_ingredients(
-    skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db),
 ):
 
     ingred_service = IngredService(db)
-    ingredients = await ingred_service.get_ingredients(skip, limit)
-    return ingredients
+    ingredients = await ingred_service.get_ingredients_json(skip, limit)
+    return conditional_json(request, ingredients)
@@ -1,50 +1,77 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from src.schemas.recipe import RecipeResponse
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
 from src.services.recipe_service import RecipeService
-from src.schemas.recipe import RecipeBase, RecipeCreate, RecipeUpdate
+from src.schemas.recipe import (
+    RecipeBase,
+    RecipeCreate,
+    RecipeUpdate,
+    RecipeMatchResponse,
+    RecipeBatchResponse,
+    RecipeSummary,
+    RecipeFields,
+)
+from src.config.config import settings
+from src.services.ingredient_index import MatchMode
 from src.schemas.user import Message
-from src.services.auth_service import get_current_user
-from src.database.user_models import User
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from fastapi import Request
+from src.services.auth_service import get_current_principal
+from src.schemas.token import Principal
+from src.services.rate_limiter import limiter
+from fastapi import Request, Response
+from src.services.pagination import decode_cursor, next_cursor
+from src.services.http_cache import conditional_json
 
 
 router = APIRouter(prefix="/recipe", tags=["recipe"])
-limiter = Limiter(key_func=get_remote_address)
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    # list bodies stay plain arrays, the cursor for the next page rides in a header
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
+# ?fields=summary swaps in RecipeSummary for card grids
+RecipeList = List[RecipeResponse] | List[RecipeSummary]
 
 
 # Public endpoints
-@router.get("/", response_model=List[RecipeResponse])
+@router.get("/", response_model=RecipeList)
 @limiter.limit("10/minute")
 async def get_all(
     request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: RecipeFields = "full",
+    db: AsyncSession = Depends(get_read_db),
 ):
     recipe_service = RecipeService(db)
-    recipes = await recipe_service.get_all_recipes(skip, limit)
+    recipes = await recipe_service.get_all_recipes(
+        skip, limit, decode_cursor(cursor, 1), fields
+    )
     if not recipes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No recepies were found!",
         )
+    set_next_cursor(response, next_cursor(recipes, limit, lambda r: (r.id,)))
     return recipes
 
 
 @router.get("/search/", response_model=List[RecipeResponse])
 async def search_recipes(
-    category: Optional[str],
-    ingredient: Optional[str],
-    area: Optional[str],
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    ingredient: Optional[str] = None,
+    area: Optional[str] = None,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
 
     recipe_service = RecipeService(db)
@@ -54,6 +81,7 @@ async def search_recipes(
         area=area,
         skip=skip,
         limit=limit,
+        q=q,
     )
     if not recipes:
         raise HTTPException(
@@ -63,36 +91,83 @@ async def search_recipes(
     return recipes
 
 
-@router.get("/popular", response_model=List[RecipeResponse])
+@router.get("/match", response_model=List[RecipeMatchResponse])
+async def match_by_ingredients(
+    ingredients: List[int] = Query(..., max_length=50),
+    mode: MatchMode = "any",
+    max_missing: int = Query(0, ge=0),
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """What can I cook: recipes ranked by how well they cover `ingredients`"""
+
+    recipe_service = RecipeService(db)
+    recipes = await recipe_service.match_by_ingredients(
+        ingredients, mode, max_missing, skip, limit
+    )
+    if not recipes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No recipes match these ingredients!",
+        )
+    return recipes
+
+
+@router.get("/batch", response_model=RecipeBatchResponse)
+@limiter.limit("15/minute")
+async def get_batch(
+    request: Request,
+    ids: List[int] = Query(..., max_length=settings.RECIPE_BATCH_MAX),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Several recipes in one call, in request order; unknown ids are listed in `missing`"""
+
+    recipe_service = RecipeService(db)
+    return await recipe_service.get_batch(ids)
+
+
+@router.get("/popular", response_model=RecipeList)
 async def get_popular(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: RecipeFields = "full",
+    db: AsyncSession = Depends(get_read_db),
 ):
 
     recipe_service = RecipeService(db)
-    recipes = await recipe_service.get_popular(skip, limit)
+    recipes = await recipe_service.get_popular(
+        skip, limit, decode_cursor(cursor, 2), fields
+    )
     if not recipes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No recepies were found!",
         )
 
+    set_next_cursor(
+        response,
+        next_cursor(recipes, limit, lambda r: (r.favorites_count, r.id)),
+    )
     return recipes
 
 
 @router.get("/{recipe_id:int}", response_model=RecipeResponse)
 @limiter.limit("15/minute")
 async def search_recipe_id(
-    request: Request, recipe_id: int, db: AsyncSession = Depends(get_db)
+    request: Request, recipe_id: int, db: AsyncSession = Depends(get_read_db)
 ):
 
     recipe_service = RecipeService(db)
-    recipe = await recipe_service.search_by_id(recipe_id)
+    recipe = await recipe_service.search_by_id_json(recipe_id)
     if recipe is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipes with you criteria wasn`t found!",
         )
-    return recipe
+    return conditional_json(request, recipe)
 
 
 # Private endoints
@@ -100,7 +175,7 @@ async def search_recipe_id(
 async def create_recipe(
     data: RecipeCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
@@ -112,12 +187,12 @@ async def edit_recipe(
     recipe_id: int,
     data: RecipeUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
 
-    recipe = await recipe_service.update_recipe(recipe_id, data, user)
+    recipe = await recipe_service.edit_recipe(recipe_id, data, user)
     if recipe is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="The recipe is not found!"
@@ -129,7 +204,7 @@ async def edit_recipe(
 async def delete_recipe(
     recipe_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
@@ -142,20 +217,26 @@ async def delete_recipe(
     return removed_recipe
 
 
-@router.get("/my", response_model=List[RecipeResponse])
+@router.get("/my", response_model=RecipeList)
 async def get_own_recipies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    fields: RecipeFields = "full",
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
-    own_recipies = await recipe_service.get_own_recipies(skip, limit, user)
+    own_recipies = await recipe_service.get_own_recipies(
+        skip, limit, user, decode_cursor(cursor, 1), fields
+    )
     if not own_recipies:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Recipies are not found!"
         )
+    set_next_cursor(response, next_cursor(own_recipies, limit, lambda r: (r.id,)))
     return own_recipies
 
 
@@ -163,7 +244,7 @@ async def get_own_recipies(
 async def add_favorite(
     recipe_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
@@ -180,7 +261,7 @@ async def add_favorite(
 async def remove_favorite(
     recipe_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
@@ -193,19 +274,25 @@ async def remove_favorite(
     return {"message": "Favorite removed successfully"}
 
 
-@router.get("/my/favorite", response_model=List[RecipeResponse])
+@router.get("/my/favorite", response_model=RecipeList)
 async def get_my_favorite(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    fields: RecipeFields = "full",
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
 
     recipe_service = RecipeService(db)
-    my_favorite = await recipe_service.get_my_favorite(skip, limit, user)
+    my_favorite = await recipe_service.get_my_favorite(
+        skip, limit, user, decode_cursor(cursor, 1), fields
+    )
     if not my_favorite:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No favorite recepies were found!!",
         )
+    set_next_cursor(response, next_cursor(my_favorite, limit, lambda r: (r.id,)))
     return my_favorite
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from src.database.db import get_db
+from src.database.db import get_read_db
 from src.schemas.user import TestimonialsResponse
 from src.services.testimonials_serv import TestimonialService
+from src.services.http_cache import conditional_json
 
 
 router = APIRouter(prefix="/testimonials", tags=["testimonials"])
@@ -12,9 +13,12 @@ router = APIRouter(prefix="/testimonials", tags=["testimonials"])
 
 @router.get("/testimonials", response_model=List[TestimonialsResponse])
 async def get_testimonials(
-    skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db),
 ):
 
     testim_service = TestimonialService(db)
-    testimonials = await testim_service.get_testimonials(skip, limit)
-    return testimonials
+    testimonials = await testim_service.get_testimonials_json(skip, limit)
+    return conditional_json(request, testimonials)
@@ -1,20 +1,19 @@
+from base64 import b64encode
 from typing import List
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.auth_service import get_current_user
-from src.database.db import get_db
-from src.database.user_models import User, UserFollowers
+from src.services.auth_service import get_current_user, get_current_principal
+from src.database.db import get_db, get_read_db
 from src.schemas.user import UserBase, UserOut, UserUpdate, Message
+from src.schemas.token import Principal
 from src.services.upload_file import UploadFileService
+from src.services.jobs import enqueue
 from src.services.user_service import UserService
-from src.config.config import settings
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from src.services.rate_limiter import limiter
 
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 @router.get("/me", response_model=UserOut)
@@ -23,29 +22,35 @@ async def me(request: Request, user: UserBase = Depends(get_current_user)):
     return user
 
 
-@router.patch("/me/avatar", response_model=UserOut)
+@router.patch(
+    "/me/avatar", response_model=UserOut, status_code=status.HTTP_202_ACCEPTED
+)
 async def update_user_avatar(
     file: UploadFile = File(),
     user: UserBase = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
 ):
-
-    avatar_url = await UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    ).upload_file(file, user.name)
-
-    user_service = UserService(db)
-    updated_user = await user_service.update_avatar_url(user.email, avatar_url)
-
-    return updated_user
+    """Validate the image now, store it in the background.
+
+    The returned user still has the old avatar; the new URL shows up once
+    the avatar.store job has run.
+    """
+    data, ext = await UploadFileService().prepare_avatar(file)
+    await enqueue(
+        "avatar.store",
+        username=user.name,
+        email=user.email,
+        data=b64encode(data).decode(),
+        ext=ext,
+    )
+    return user
 
 
 @router.get("/me/following", response_model=List[UserOut])
 async def get_following(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
 
     user_service = UserService(db)
@@ -56,8 +61,8 @@ async def get_following(
 async def get_followers(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
     user_service = UserService(db)
     return await user_service.get_followers(user.id, skip, limit)
@@ -66,7 +71,7 @@ async def get_followers(
 @router.patch("/me", response_model=UserUpdate)
 async def update_me(
     body: UserUpdate,
-    user: UserUpdate = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     user_service = UserService(db)
@@ -91,7 +96,7 @@ async def update_me(
 async def follow_user(
     to_follow_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
     if to_follow_id == user.id:
         raise HTTPException(
@@ -115,7 +120,7 @@ async def follow_user(
 async def unfollow_user(
     unfollow_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
 ):
     if unfollow_id == user.id:
         raise HTTPException(
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_db, sessionmanager
+from src.services.auth_service import require_ops_token
+from src.services.cache import cache_stats
 
 router = APIRouter(tags=["utils"])
 
@@ -25,3 +27,17 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get(
+    "/cache/stats", include_in_schema=False, dependencies=[Depends(require_ops_token)]
+)
+async def get_cache_stats():
+    return cache_stats()
+
+
+@router.get(
+    "/db/pool", include_in_schema=False, dependencies=[Depends(require_ops_token)]
+)
+async def get_pool_status():
+    return sessionmanager.pool_status()
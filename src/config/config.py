@@ -1,3 +1,5 @@
+from typing import List, Literal
+
 from pydantic import ConfigDict, EmailStr
 from pydantic_settings import BaseSettings
 
@@ -5,6 +7,21 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
 
     DB_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5  # connections opened at startup
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 keeps the server default
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements
+
+    DB_REPLICA_URLS: List[str] = []  # JSON list in the env
+    DB_REPLICA_STRATEGY: Literal["round_robin", "least_loaded"] = "round_robin"
+    DB_REPLICA_STICKY_SECONDS: int = 5  # primary reads after a client's write
+    DB_REPLICA_CONNECT_TIMEOUT: int = 2  # seconds before falling back to the primary
+    DB_REPLICA_HEALTH_TTL: int = 10  # seconds a working replica is used unprobed
+    DB_REPLICA_RETRY_SECONDS: int = 30  # a failed replica is skipped this long
 
     JWT_SECRET: str
     JWT_ALGORITHM: str
@@ -12,6 +29,8 @@ class Settings(BaseSettings):
 
     REFRESH_TOKEN_EXPIRE_MINUTES: int  # 7 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_STORE: Literal["redis", "db"] = "redis"
+    JWT_CACHE_SIZE: int = 4096  # verified access tokens kept in memory
 
     CLD_NAME: str
     CLD_API_KEY: int
@@ -19,6 +38,55 @@ class Settings(BaseSettings):
 
     SEED_USER_PASSWORD: str
 
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_POOL_SIZE: int = 20
+    REDIS_POOL_TIMEOUT: int = 5  # seconds to wait for a free connection
+    REDIS_BACKEND: Literal["redis", "memory"] = "redis"
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_URI: str = ""  # empty: the REDIS_* server
+    RATE_LIMIT_STRATEGY: Literal[
+        "fixed-window", "moving-window", "sliding-window-counter"
+    ] = "sliding-window-counter"
+
+    HASH_WORKERS: int = 4
+    HASH_MAX_PENDING: int = 32  # running + queued bcrypt jobs before 503
+
+    AVATAR_STORAGE: Literal["cloudinary", "local"] = "cloudinary"
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_LOCAL_DIR: str = "media"  # AVATAR_STORAGE=local only
+    AVATAR_LOCAL_URL: str = "/media"
+    UPLOAD_WORKERS: int = 4  # threads for storage uploads
+    UPLOAD_MAX_PENDING: int = 16
+    IMAGE_WORKERS: int = 2  # processes for resizing
+    IMAGE_MAX_PENDING: int = 8
+
+    JOB_WORKER_IN_APP: bool = True  # False: run `python src/worker.py` instead
+    JOB_CONCURRENCY: int = 2  # jobs a worker runs at once
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE: int = 2  # retry n waits base ** n seconds
+    JOB_DEAD_LETTERS: int = 100  # failed jobs kept for inspection
+
+    METRICS_ENABLED: bool = True  # /metrics and the timing middleware
+    OPS_TOKEN: str = ""  # bearer token for /metrics and stats; empty: 404
+    QUERY_PROFILING: bool = False  # debug: per-request SQL report, not for prod
+    QUERY_SLOW_MS: int = 100
+    QUERY_REPEAT_THRESHOLD: int = 3  # same statement this often -> N+1 suspect
+
+    TAXONOMY_CACHE_SIZE: int = 256  # cached (skip, limit) pages per endpoint
+    TAXONOMY_CACHE_TTL: int = 3600  # seconds
+
+    HTTP_CACHE_MAX_AGE: int = 60  # Cache-Control max-age of catalogue endpoints
+
+    INGREDIENT_INDEX_TTL: int = 300  # seconds before a full index rebuild
+    RECIPE_BATCH_MAX: int = 50  # ids per /recipe/batch call
+
+    RECIPE_CACHE_TTL: int = 300  # seconds in Redis
+    RECIPE_CACHE_L1_SIZE: int = 1024
+    RECIPE_CACHE_L1_TTL: int = 5  # bounds staleness across workers
+
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
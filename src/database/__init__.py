@@ -1,5 +1,5 @@
 from .base import Base
-from .user_models import User, UserFavoriteRecipe, UserFollowers, Testimonial
+from .user_models import User, UserFavoriteRecipe, UserFollowers, Testimonial, RefreshToken
 from .recipe_models import Recipe, RecipeIngredient
 from .ingredient_models import Ingredient
 from .taxonomy_models import Category, Area
@@ -1,34 +1,294 @@
+import asyncio
 import contextlib
-from sqlalchemy.exc import SQLAlchemyError
+import itertools
+import logging
+import time
+from typing import Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config.config import settings
 
+logger = logging.getLogger(__name__)
+
+# errors that mean the replica itself is unreachable, not a bad query
+REPLICA_DOWN_ERRORS = (OSError, asyncio.TimeoutError)
+
+# set after a successful write so the same client reads its own writes
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def wait_stats(self) -> dict:
+        return {
+            "count": self.wait_count,
+            "avg_ms": round(self.wait_total / self.wait_count * 1000, 3)
+            if self.wait_count
+            else 0.0,
+            "max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def engine_options(url: str, connect_timeout: float | None = None) -> dict:
+    """create_async_engine kwargs for `url` built from the DB_* settings"""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    backend = make_url(url).get_backend_name()
+
+    # SQLite (tests, local runs) keeps the dialect's default pool
+    if backend != "sqlite":
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+
+    if backend == "postgresql":
+        server_settings = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        }
+        if connect_timeout:
+            options["connect_args"]["timeout"] = connect_timeout
+    return options
+
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
+    def __init__(self, url: str, replica_urls: Sequence[str] = ()):
+        self._engine: AsyncEngine | None = create_async_engine(
+            url, **engine_options(url)
+        )
         self._sessionmaker: async_sessionmaker = async_sessionmaker(
             autoflush=False, autocommit=False, bind=self._engine
         )
+        self._replicas: list[AsyncEngine] = [
+            create_async_engine(
+                replica,
+                # fail fast so a replica dropping packets falls back to the primary
+                **engine_options(replica, settings.DB_REPLICA_CONNECT_TIMEOUT),
+            )
+            for replica in replica_urls
+        ]
+        self._replica_sessionmakers = [
+            async_sessionmaker(autoflush=False, autocommit=False, bind=engine)
+            for engine in self._replicas
+        ]
+        self._round_robin = itertools.count()
+        # monotonic times: last proof a replica works, end of its backoff
+        self._replica_ok_at = [float("-inf")] * len(self._replicas)
+        self._replica_down_until = [0.0] * len(self._replicas)
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        """The primary and every replica"""
+        if self._engine is None:
+            return []
+        return [self._engine, *self._replicas]
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def _pick_replica(self) -> int | None:
+        now = time.monotonic()
+        healthy = [
+            i for i, until in enumerate(self._replica_down_until) if until <= now
+        ]
+        if not healthy:
+            return None
+        start = next(self._round_robin) % len(healthy)
+        order = healthy[start:] + healthy[:start]
+        if settings.DB_REPLICA_STRATEGY == "round_robin":
+            return order[0]
+        # least loaded by checked out connections, round robin breaks ties
+        return min(order, key=lambda i: self._replicas[i].pool.checkedout())
+
+    def _replica_failed(self, index: int, error: Exception):
+        self._replica_ok_at[index] = float("-inf")
+        self._replica_down_until[index] = (
+            time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+        )
+        logger.warning(
+            "Replica %s unavailable, reading from primary for %ss: %s",
+            index,
+            settings.DB_REPLICA_RETRY_SECONDS,
+            error,
+        )
 
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, readonly: bool = False):
         if self._sessionmaker is None:
             raise Exception("Database session is not initialized")
-        session = self._sessionmaker()
+
+        index, session = await self._replica_session() if readonly else (None, None)
+        if session is None:
+            session = self._sessionmaker()
         try:
             yield session
         except SQLAlchemyError as e:
+            if index is not None and getattr(e, "connection_invalidated", False):
+                self._replica_failed(index, e)
             await session.rollback()
             raise  # Re-raise the original error
+        except REPLICA_DOWN_ERRORS as e:
+            if index is not None:
+                self._replica_failed(index, e)
+            raise
+        else:
+            if index is not None and session.in_transaction():
+                self._replica_ok_at[index] = time.monotonic()
         finally:
             await session.close()
 
+    async def _replica_session(self):
+        """(index, session) on a healthy replica, (None, None) if there is none.
+
+        A replica that worked within DB_REPLICA_HEALTH_TTL is handed out
+        without connecting, so handlers served from memory never check out a
+        connection; others are probed first. A failed replica is skipped for
+        DB_REPLICA_RETRY_SECONDS.
+        """
+        if not self._replicas:
+            return None, None
+        index = self._pick_replica()
+        if index is None:
+            return None, None
+        session = self._replica_sessionmakers[index]()
+        if time.monotonic() - self._replica_ok_at[index] < settings.DB_REPLICA_HEALTH_TTL:
+            return index, session
+        try:
+            await session.connection()
+        except (DBAPIError, *REPLICA_DOWN_ERRORS) as e:
+            self._replica_failed(index, e)
+            await session.close()
+            return None, None
+        self._replica_ok_at[index] = time.monotonic()
+        return index, session
+
+    async def warmup(self, connections: int):
+        """Open `connections` pooled connections up front so first requests don't pay for it"""
+
+        async def ping(engine: AsyncEngine):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        async def warm_replica(index: int, engine: AsyncEngine):
+            # a dead replica must not keep the app from starting; one probe
+            # first so it is logged once, then the rest of its connections
+            try:
+                await ping(engine)
+            except (DBAPIError, *REPLICA_DOWN_ERRORS) as e:
+                self._replica_failed(index, e)
+                return
+            self._replica_ok_at[index] = time.monotonic()
+            await asyncio.gather(
+                *(ping(engine) for _ in range(connections - 1)),
+                return_exceptions=True,
+            )
+
+        if connections > 0:
+            await asyncio.gather(
+                *(ping(self._engine) for _ in range(connections)),
+                *(
+                    warm_replica(index, engine)
+                    for index, engine in enumerate(self._replicas)
+                ),
+            )
+
+    @staticmethod
+    def _engine_status(engine: AsyncEngine) -> dict:
+        pool = engine.pool
+        status = {"pool": type(pool).__name__}
+        if hasattr(pool, "checkedout"):
+            status.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        if isinstance(pool, TimedQueuePool):
+            status["wait"] = pool.wait_stats()
+        return status
 
-sessionmanager = DatabaseSessionManager(settings.DB_URL)
+    def pool_status(self) -> dict:
+        status = self._engine_status(self._engine)
+        status["replicas"] = [self._engine_status(e) for e in self._replicas]
+        return status
+
+    async def close(self):
+        if self._engine is None:
+            return
+        for engine in (self._engine, *self._replicas):
+            await engine.dispose()
+        self._engine = None
+        self._sessionmaker = None
+        self._replicas = []
+        self._replica_sessionmakers = []
+        self._replica_ok_at = []
+        self._replica_down_until = []
+
+
+sessionmanager = DatabaseSessionManager(settings.DB_URL, settings.DB_REPLICA_URLS)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Read-your-writes: recent writers and explicit opt-ins skip the replicas"""
+    if request.headers.get(READ_PRIMARY_HEADER) == "1":
+        return True
+    try:
+        return int(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_primary_reads(response: Response):
+    seconds = settings.DB_REPLICA_STICKY_SECONDS
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        str(int(time.time()) + seconds),
+        max_age=seconds,
+        httponly=True,
+        samesite="lax",
+    )
 
 
 async def get_db():
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_db(request: Request):
+    """Session for read-only handlers, served by a replica when one is configured"""
+    readonly = not reads_from_primary(request)
+    async with sessionmanager.session(readonly=readonly) as session:
+        yield session
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Text, ForeignKey, Date
+from sqlalchemy import Integer, String, Text, ForeignKey, Date, Index
 from datetime import date
 from typing import Optional
 from src.database.base import Base
@@ -15,13 +15,24 @@ class Recipe(Base):
     time: Mapped[int] = mapped_column(Integer, nullable=False)
     thumb: Mapped[str] = mapped_column(String(255), nullable=False)
 
-    ownerId: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    categoryId: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
+    # denormalized len(fans), kept in step by RecipeRepo.add/remove_favorite
+    favorites_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    ownerId: Mapped[int] = mapped_column(
+        ForeignKey("users.id"), nullable=False, index=True
+    )
+    categoryId: Mapped[int] = mapped_column(
+        ForeignKey("categories.id"), nullable=False, index=True
+    )
 
     owner = relationship("User", back_populates="recipes")
     category = relationship("Category", back_populates="recipes")
 
-    areaId: Mapped[int] = mapped_column(ForeignKey("areas.id"), nullable=False)
+    areaId: Mapped[int] = mapped_column(
+        ForeignKey("areas.id"), nullable=False, index=True
+    )
     area = relationship("Area", back_populates="recipes")
 
     recipeIngredients = relationship(
@@ -42,13 +53,18 @@ class Recipe(Base):
         overlaps="user, recipe, userFavoriteRecipes",
     )
 
+    __table_args__ = (
+        # serves /popular as an index-ordered range read
+        Index("ix_recipes_popularity", favorites_count.desc(), id.desc()),
+    )
+
 
 class RecipeIngredient(Base):
     __tablename__ = "recipeIngredients"
 
     recipeId: Mapped[int] = mapped_column(ForeignKey("recipes.id"), primary_key=True)
     ingredientId: Mapped[int] = mapped_column(
-        ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True
+        ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     # If extra fields like quantity:
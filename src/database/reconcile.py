@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(BASE_DIR))
+
+import asyncio
+from src.database.db import sessionmanager
+from src.repo.recipe_repo import RecipeRepo
+
+
+async def reconcile_favorites():
+    """Repair drift between recipes.favorites_count and userFavoriteRecipes"""
+    async with sessionmanager.session() as session:
+        fixed = await RecipeRepo(session).reconcile_favorites_count()
+    print(f"🔁 favorites_count reconciled, {fixed} recipes fixed.")
+    return fixed
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_favorites())
@@ -0,0 +1,116 @@
+import time
+from typing import Optional
+
+from redis import asyncio as aioredis
+
+from src.config.config import settings
+
+
+class InMemoryRedis:
+    """Process-local stand-in for the Redis commands the app uses.
+
+    Selected with REDIS_BACKEND=memory for local runs and benchmarks; tests can
+    also plug in `fakeredis.aioredis.FakeRedis()` through `redis_manager.override`.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, Optional[float]]] = {}
+
+    def _alive(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._alive(key)
+
+    async def set(self, key: str, value, ex: Optional[int] = None, nx: bool = False):
+        if nx and self._alive(key) is not None:
+            return None
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (self._encode(value), expires_at)
+        return True
+
+    async def getdel(self, key: str) -> Optional[bytes]:
+        value = self._alive(key)
+        if value is not None:
+            del self._data[key]
+        return value
+
+    async def incr(self, key: str) -> int:
+        value = int(self._alive(key) or 0) + 1
+        item = self._data.get(key)  # keeps the TTL, like Redis
+        self._data[key] = (self._encode(value), item[1] if item else None)
+        return value
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        value = self._alive(key)
+        if value is None:
+            return False
+        self._data[key] = (value, time.monotonic() + seconds)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self):
+        self._data.clear()
+
+
+class RedisManager:
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client():
+        if settings.REDIS_BACKEND == "memory":
+            return InMemoryRedis()
+
+        # blocking pool: callers wait for a free connection instead of
+        # opening unbounded sockets under load
+        pool = aioredis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            max_connections=settings.REDIS_POOL_SIZE,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+        )
+        return aioredis.Redis(connection_pool=pool)
+
+    def override(self, client):
+        """Swap the client, e.g. for a fakeredis instance in tests"""
+        self._client = client
+
+    async def close(self):
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+
+
+redis_manager = RedisManager()
@@ -4,7 +4,11 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(BASE_DIR))
 
+import argparse
 import json
+import time
+from contextlib import contextmanager
+from typing import Iterator
 from src.database.taxonomy_models import Area, Category
 from src.database.recipe_models import Recipe, RecipeIngredient
 from src.database.ingredient_models import Ingredient
@@ -14,16 +18,20 @@ from src.services.auth_service import Hash
 from src.config.config import settings
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import insert, text
 
 import asyncio
 from sqlalchemy.future import select
 
 
 class Seeder:
-    def __init__(self):
+    def __init__(self, bulk: bool = False, batch_size: int = 1000):
         self.data_path = BASE_DIR / "src" / "database" / "data"
         self.hash = Hash()
+        self.bulk = bulk
+        self.batch_size = batch_size
+        self._password_hash = None
+        self.timings = {}
         self.id_maps = {
             "users": {},
             "ingredients": {},
@@ -37,9 +45,74 @@ class Seeder:
         with open(self.data_path / filename, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def _iter_data(self, filename: str, chunk_size: int = 64 * 1024) -> Iterator[dict]:
+        """Stream the objects of a top-level JSON array chunk by chunk"""
+        decoder = json.JSONDecoder()
+        with open(self.data_path / filename, "r", encoding="utf-8") as f:
+            buffer = f.read(chunk_size).lstrip()
+            if not buffer.startswith("["):
+                raise ValueError(f"{filename} is not a JSON array")
+            buffer = buffer[1:]
+
+            while True:
+                buffer = buffer.lstrip().lstrip(",").lstrip()
+                if buffer.startswith("]"):
+                    return
+                try:
+                    # items are objects, so a truncated one never decodes
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        raise
+                    buffer += chunk
+                    continue
+                yield item
+                buffer = buffer[end:]
+
+    def _batches(self, filename: str) -> Iterator[list]:
+        batch = []
+        for item in self._iter_data(filename):
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @property
+    def password_hash(self) -> str:
+        """Every seeded user shares one bcrypt hash, computed once"""
+        if self._password_hash is None:
+            self._password_hash = self.hash.get_pass_hash("test123")  # Hardcoded
+        return self._password_hash
+
+    @contextmanager
+    def _timed(self, table: str):
+        start = time.perf_counter()
+        yield
+        self.timings[table] = time.perf_counter() - start
+
+    def _print_timings(self):
+        print("\nSeeding time per table:")
+        for table, seconds in self.timings.items():
+            print(f"{table:<14} {seconds * 1000:>9.1f} ms")
+        print(f"{'total':<14} {sum(self.timings.values()) * 1000:>9.1f} ms")
+
+    async def _insert_returning_ids(
+        self, session: AsyncSession, model, rows: list
+    ) -> list:
+        """Multi-row INSERT ... RETURNING id, ids in the same order as rows"""
+        if not rows:
+            return []
+        query = insert(model).returning(model.id, sort_by_parameter_order=True)
+        result = await session.execute(query, rows)
+        return result.scalars().all()
+
     async def _clear_tables(self, session: AsyncSession):
         """Clear all tables in proper order"""
         tables = [
+            "refresh_tokens",
             "userFavoriteRecipes",
             "userFollowers",
             "recipeIngredients",
@@ -50,15 +123,21 @@ class Seeder:
             "areas",
             "users",
         ]
+        # SQLite has no TRUNCATE; DELETE in child-first order does the same,
+        # and ids restart because the tables have no AUTOINCREMENT
+        sqlite = session.bind.dialect.name == "sqlite"
         for table in tables:
-            # await session.execute(text(f"TRUNCATE TABLE {table} CASCADE"))
+            statement = (
+                f'DELETE FROM "{table}"'
+                if sqlite
+                else f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE'
+            )
             try:
-                await session.execute(
-                    text(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE')
-                )
+                async with session.begin_nested():
+                    await session.execute(text(statement))
             except Exception as e:
                 print(f"⚠️ Skipping {table} (might not exist): {e}")
-        print("🧹 All listed tables truncated. IDs restarted.")
+        print("🧹 All listed tables cleared. IDs restarted.")
 
     async def seed_users(self, session: AsyncSession):
         """Seed users with hardcoded password for accessibility"""
@@ -69,7 +148,7 @@ class Seeder:
                 name=user["name"],
                 email=user["email"],
                 avatar=user["avatar"],
-                hashed_password=self.hash.get_pass_hash("test123"),  # Hardcoded
+                hashed_password=self.password_hash,
             )
             session.add(db_user)
             await session.flush()
@@ -183,6 +262,125 @@ class Seeder:
                     Testimonial(testimonial=testimonial["testimonial"], userId=user_id)
                 )
 
+    async def bulk_seed_users(self, session: AsyncSession):
+        """Seed users with multi-row inserts"""
+        for batch in self._batches("users.json"):
+            rows = [
+                {
+                    "name": user["name"],
+                    "email": user["email"],
+                    "avatar": user["avatar"],
+                    "hashed_password": self.password_hash,
+                }
+                for user in batch
+            ]
+            ids = await self._insert_returning_ids(session, User, rows)
+            for user, db_id in zip(batch, ids):
+                self.id_maps["users"][user["_id"]["$oid"]] = db_id
+
+    async def bulk_seed_areas(self, session: AsyncSession):
+        """Seed areas with multi-row inserts"""
+        for batch in self._batches("areas.json"):
+            rows = [{"name": area["name"]} for area in batch]
+            ids = await self._insert_returning_ids(session, Area, rows)
+            for area, db_id in zip(batch, ids):
+                self.id_maps["areas"][area["name"]] = db_id
+
+    async def bulk_seed_categories(self, session: AsyncSession):
+        """Seed categories with multi-row inserts"""
+        for batch in self._batches("categories.json"):
+            rows = [{"name": category["name"]} for category in batch]
+            ids = await self._insert_returning_ids(session, Category, rows)
+            for category, db_id in zip(batch, ids):
+                self.id_maps["categories"][category["name"]] = db_id
+
+    async def bulk_seed_ingredients(self, session: AsyncSession):
+        """Seed ingredients with multi-row inserts"""
+        for batch in self._batches("ingredients.json"):
+            rows = [
+                {
+                    "name": ingredient["name"],
+                    "description": ingredient["desc"],
+                    "imgUrl": ingredient["img"],
+                }
+                for ingredient in batch
+            ]
+            ids = await self._insert_returning_ids(session, Ingredient, rows)
+            for ingredient, db_id in zip(batch, ids):
+                self.id_maps["ingredients"][ingredient["_id"]] = db_id
+
+    async def bulk_seed_recipes(self, session: AsyncSession):
+        """Seed recipes and their ingredients with multi-row inserts"""
+        missing_count = {"owner": 0, "area": 0, "category": 0}
+
+        for batch in self._batches("recipes.json"):
+            valid, rows = [], []
+            for recipe in batch:
+                owner_id = self.id_maps["users"].get(recipe["owner"]["$oid"])
+                area_id = self.id_maps["areas"].get(recipe["area"])
+                category_id = self.id_maps["categories"].get(recipe["category"])
+
+                if not owner_id:
+                    missing_count["owner"] += 1
+                    continue
+                if not area_id:
+                    missing_count["area"] += 1
+                    continue
+                if not category_id:
+                    missing_count["category"] += 1
+                    continue
+
+                valid.append(recipe)
+                rows.append(
+                    {
+                        "title": recipe["title"],
+                        "instructions": recipe["instructions"],
+                        "description": recipe["description"],
+                        "thumb": recipe["thumb"],
+                        "time": int(recipe["time"] or 0),
+                        "ownerId": owner_id,
+                        "areaId": area_id,
+                        "categoryId": category_id,
+                    }
+                )
+
+            ids = await self._insert_returning_ids(session, Recipe, rows)
+
+            ingredient_rows = []
+            for recipe, db_id in zip(valid, ids):
+                self.id_maps["recipes"][recipe["_id"]["$oid"]] = db_id
+                for ingredient in recipe.get("ingredients", []):
+                    ing_id = self.id_maps["ingredients"].get(ingredient["id"])
+                    if ing_id:
+                        ingredient_rows.append(
+                            {
+                                "recipeId": db_id,
+                                "ingredientId": ing_id,
+                                "measure": ingredient["measure"],
+                            }
+                        )
+            if ingredient_rows:
+                await session.execute(insert(RecipeIngredient), ingredient_rows)
+
+        print("\nMissing relationships summary:")
+        print(f"Owners: {missing_count['owner']}")
+        print(f"Areas: {missing_count['area']}")
+        print(f"Categories: {missing_count['category']}")
+
+    async def bulk_seed_testimonials(self, session: AsyncSession):
+        """Seed testimonials with multi-row inserts"""
+        for batch in self._batches("testimonials.json"):
+            rows = [
+                {
+                    "testimonial": testimonial["testimonial"],
+                    "userId": self.id_maps["users"][testimonial["owner"]["$oid"]],
+                }
+                for testimonial in batch
+                if testimonial["owner"]["$oid"] in self.id_maps["users"]
+            ]
+            if rows:
+                await session.execute(insert(Testimonial), rows)
+
     async def run(self):
         """Execute the seeding process"""
         async with sessionmanager.session() as session:
@@ -191,14 +389,20 @@ class Seeder:
                     await self._clear_tables(session)
 
                     # Seed in proper dependency order
-                    await self.seed_users(session)
-                    await self.seed_areas(session)
-                    await self.seed_categories(session)
-                    await self.seed_ingredients(session)
-                    await self.seed_recipes(session)
-                    await self.seed_testimonials(session)
+                    prefix = "bulk_seed_" if self.bulk else "seed_"
+                    for table in (
+                        "users",
+                        "areas",
+                        "categories",
+                        "ingredients",
+                        "recipes",
+                        "testimonials",
+                    ):
+                        with self._timed(table):
+                            await getattr(self, prefix + table)(session)
 
                     print("✅ Database seeded successfully!")
+                    self._print_timings()
                 except Exception as e:
                     await session.rollback()
                     print(f"❌ Seeding failed: {e}")
@@ -206,5 +410,13 @@ class Seeder:
 
 
 if __name__ == "__main__":
-    seeder = Seeder()
+    parser = argparse.ArgumentParser(description="Reset and seed the database")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="multi-row INSERT ... RETURNING instead of one flush per row",
+    )
+    args = parser.parse_args()
+
+    seeder = Seeder(bulk=args.bulk)
     asyncio.run(seeder.run())
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey, Text, Column
+from sqlalchemy import Integer, String, ForeignKey, Text, Column, DateTime
 from typing import Optional
+from datetime import datetime
 from src.database.base import Base
 
 
@@ -28,8 +29,6 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String)
     avatar: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
-    refresh_token: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-
     recipes = relationship("Recipe", back_populates="owner")
     testimonials = relationship("Testimonial", back_populates="user")
 
@@ -80,3 +79,17 @@ class Testimonial(Base):
 
     userId: Mapped[int] = mapped_column(ForeignKey("users.id"))
     user = relationship("User", back_populates="testimonials")
+
+
+class RefreshToken(Base):
+    """One row per live session when refresh tokens are kept in the database"""
+
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    userId: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
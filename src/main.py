@@ -1,8 +1,13 @@
-from fastapi import FastAPI, Request, status
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request, status
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from slowapi.errors import RateLimitExceeded
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
 from src.api import (
     utils,
@@ -14,8 +19,39 @@ from src.api import (
     auth,
     users,
 )
+from src.config.config import settings
+from src.database.db import sessionmanager, mark_primary_reads
+from src.database.redis_client import redis_manager
+from src.services.auth_service import Hash, require_ops_token
+from src.services.executors import ExecutorSaturated
+from src.services.rate_limiter import limiter
+from src.services.image_storage import upload_pool
+from src.services.upload_file import image_pool
+from src.services.jobs import MemoryQueue, Worker, job_queue
+from src.services import tasks  # registers the job handlers
+from src.services import metrics, query_profiler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await sessionmanager.warmup(settings.DB_POOL_WARMUP)
+    # the in-memory queue is only reachable from this process
+    worker = None
+    if settings.JOB_WORKER_IN_APP or isinstance(job_queue, MemoryQueue):
+        worker = Worker()
+        await worker.start()
+    yield
+    if worker is not None:
+        await worker.stop()
+    await sessionmanager.close()
+    await redis_manager.close()
+    Hash.pool.shutdown()
+    upload_pool.shutdown()
+    image_pool.shutdown()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+app.state.limiter = limiter
 origins = ["*"]
 app.add_middleware(
     CORSMiddleware,
@@ -23,9 +59,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Next-Cursor", "ETag", query_profiler.PROFILE_HEADER],
 )
 
 
+if sessionmanager.has_replicas:
+
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+        ):
+            mark_primary_reads(response)
+        return response
+
+
+if settings.QUERY_PROFILING:
+    for engine in sessionmanager.engines:
+        query_profiler.instrument_engine(engine)
+
+    @app.middleware("http")
+    async def profile_queries(request: Request, call_next):
+        profile = query_profiler.QueryProfile()
+        token = query_profiler.current_profile.set(profile)
+        try:
+            response = await call_next(request)
+        finally:
+            query_profiler.current_profile.reset(token)
+        route = request.scope.get("route")
+        query_profiler.report(
+            request.method,
+            metrics.route_template(request.scope),
+            getattr(route, "name", None),
+            profile,
+        )
+        response.headers[query_profiler.PROFILE_HEADER] = profile.header()
+        return response
+
+
+if settings.METRICS_ENABLED:
+    for engine in sessionmanager.engines:
+        metrics.instrument_engine(engine)
+
+    # declared last, so it wraps everything else, the profiler included
+    @app.middleware("http")
+    async def collect_metrics(request: Request, call_next):
+        stats = metrics.RequestStats()
+        token = metrics.request_stats.set(stats)
+        metrics.IN_FLIGHT.inc()
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            metrics.IN_FLIGHT.dec()
+            metrics.request_stats.reset(token)
+            metrics.observe_request(
+                request.method,
+                metrics.route_template(request.scope),
+                status_code,
+                time.perf_counter() - start,
+                stats,
+            )
+
+    # scrape with the OPS_TOKEN as bearer token
+    @app.get(
+        "/metrics", include_in_schema=False, dependencies=[Depends(require_ops_token)]
+    )
+    async def get_metrics():
+        return PlainTextResponse(
+            metrics.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
@@ -34,6 +144,15 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     )
 
 
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"Error": "The server is busy. Try again in a moment."},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(utils.router, prefix="/api")
 app.include_router(recipe.router, prefix="/api")
 app.include_router(testimonials.router, prefix="/api")
@@ -43,6 +162,14 @@ app.include_router(categories.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 
+if settings.AVATAR_STORAGE == "local":
+    os.makedirs(settings.AVATAR_LOCAL_DIR, exist_ok=True)
+    app.mount(
+        settings.AVATAR_LOCAL_URL,
+        StaticFiles(directory=settings.AVATAR_LOCAL_DIR),
+        name="media",
+    )
+
 
 @app.get("/")
 async def root():
@@ -3,14 +3,20 @@ from typing import List
 from sqlalchemy.future import select
 
 from src.database.taxonomy_models import Area
+from src.schemas.taxonomy import AreaResponse
+from src.repo.rows import columns_for, fetch_as
 
 
 class AreasRepo:
     def __init__(self, session: AsyncSession):
         self.db = session
 
-    async def get_areas(self, skip, limit) -> List[Area]:
+    async def get_areas(self, skip, limit) -> List[AreaResponse]:
 
-        query = select(Area).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        query = (
+            select(*columns_for(Area, AreaResponse))
+            .order_by(Area.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await fetch_as(self.db, query, AreaResponse)
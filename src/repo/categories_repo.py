@@ -3,14 +3,20 @@ from typing import List
 from sqlalchemy.future import select
 
 from src.database.taxonomy_models import Category
+from src.schemas.taxonomy import CategoryResponse
+from src.repo.rows import columns_for, fetch_as
 
 
 class CategoryRepo:
     def __init__(self, session: AsyncSession):
         self.db = session
 
-    async def get_categories(self, skip, limit) -> List[Category]:
+    async def get_categories(self, skip, limit) -> List[CategoryResponse]:
 
-        query = select(Category).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        query = (
+            select(*columns_for(Category, CategoryResponse))
+            .order_by(Category.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await fetch_as(self.db, query, CategoryResponse)
@@ -3,6 +3,8 @@ from typing import List
 from sqlalchemy.future import select
 
 from src.database.ingredient_models import Ingredient
+from src.schemas.ingridients import IngredientResponse
+from src.repo.rows import columns_for, fetch_as
 
 
 class IngredRepo:
@@ -10,9 +12,12 @@ class IngredRepo:
     def __init__(self, session: AsyncSession):
         self.db = session
 
-    async def get_ingredients(self, skip, limit) -> List[Ingredient]:
+    async def get_ingredients(self, skip, limit) -> List[IngredientResponse]:
 
-        query = select(Ingredient).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-
-        return result.scalars().all()
+        query = (
+            select(*columns_for(Ingredient, IngredientResponse))
+            .order_by(Ingredient.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await fetch_as(self.db, query, IngredientResponse)
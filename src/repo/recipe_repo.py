@@ -1,27 +1,56 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from src.database.recipe_models import Recipe
-from src.database.taxonomy_models import Area, Category
-from src.database.ingredient_models import Ingredient
-from src.database.user_models import UserFavoriteRecipe, User
-from src.schemas.recipe import RecipeCreate, RecipeUpdate
+from src.database.recipe_models import Recipe, RecipeIngredient
+from src.database.user_models import UserFavoriteRecipe
+from src.schemas.token import Principal
+from src.schemas.recipe import (
+    RecipeCreate,
+    RecipeUpdate,
+    RecipeResponse,
+    RecipeSummary,
+    RecipeFields,
+)
+from src.repo import recipe_search
+from src.repo.rows import columns_for, fetch_as
+from src.services.ingredient_index import ingredient_index
+from src.services.recipe_cache import recipe_cache
 from typing import Optional
-from sqlalchemy import and_, func, desc, insert, delete
+from sqlalchemy import and_, func, desc, insert, delete, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload, contains_eager
+from sqlalchemy.orm import joinedload, selectinload
+
+
+# ?fields= projection -> (response schema, the columns it reads)
+RECIPE_PROJECTIONS = {
+    fields: (schema, columns_for(Recipe, schema))
+    for fields, schema in (("full", RecipeResponse), ("summary", RecipeSummary))
+}
 
 
 class RecipeRepo:
     def __init__(self, session: AsyncSession):
         self.db = session
 
-    async def get_all_recipes(self, skip: int, limit: int) -> List[Recipe]:
-
-        query = select(Recipe).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+    async def get_all_recipes(
+        self,
+        skip: int,
+        limit: int,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ) -> List[RecipeResponse | RecipeSummary]:
+
+        schema, columns = RECIPE_PROJECTIONS[fields]
+        query = select(*columns).order_by(Recipe.id)
+        if cursor:
+            # keyset: continue right after the last seen id
+            query = query.where(Recipe.id > cursor[0])
+        else:
+            query = query.offset(skip)
+
+        return await fetch_as(self.db, query.limit(limit), schema)
 
     async def search_recipes(
         self,
@@ -30,32 +59,58 @@ class RecipeRepo:
         area: Optional[str],
         skip,
         limit,
+        q: Optional[str] = None,
     ) -> List[Recipe]:
-        query = select(Recipe).options(
-            joinedload(Recipe.category),
-            joinedload(Recipe.ingredients),
-            joinedload(Recipe.area),
-        )
+        # phase 1: page over matching ids only, so LIMIT counts recipes
+        # rather than recipe x ingredient rows
+        query = select(Recipe.id)
 
         filters = []
+        rank = None
 
+        if q:
+            dialect = self.db.get_bind().dialect.name
+            text_filter, rank = recipe_search.text_search(dialect, q)
+            filters.append(text_filter)
         if category:
-            filters.append(Recipe.category.has(Category.name.ilike(f"%{category}%")))
+            filters.append(recipe_search.category_filter(category))
         if ingredient:
-            filters.append(
-                Recipe.ingredients.any(Ingredient.name.ilike(f"%{ingredient}%"))
-            )
+            filters.append(recipe_search.ingredient_filter(ingredient))
         if area:
-            filters.append(Recipe.area.has(Area.name.ilike(f"%{area}%")))
+            filters.append(recipe_search.area_filter(area))
 
         if filters:
             # Combine all filters with AND (all must match)
             query = query.where(and_(*filters))
 
+        if rank is not None:
+            query = query.order_by(desc(rank), Recipe.id)
+        else:
+            query = query.order_by(Recipe.id)
+
         query = query.offset(skip).limit(limit)
 
         result = await self.db.execute(query)
-        return result.scalars().unique().all()
+        # phase 2: batch-load the page with its relationships
+        return await self.recipes_by_ids(result.scalars().all())
+
+    async def recipes_by_ids(self, ids: List[int]) -> List[Recipe]:
+        """Recipes with category, area and ingredients, in the order of `ids`"""
+        if not ids:
+            return []
+
+        query = (
+            select(Recipe)
+            .where(Recipe.id.in_(ids))
+            .options(
+                selectinload(Recipe.category),
+                selectinload(Recipe.area),
+                selectinload(Recipe.ingredients),
+            )
+        )
+        result = await self.db.execute(query)
+        by_id = {recipe.id: recipe for recipe in result.scalars()}
+        return [by_id[recipe_id] for recipe_id in ids if recipe_id in by_id]
 
     async def recipe_by_id(self, recipe_id) -> Recipe | None:
         # query = select(Recipe).filter_by(id=recipe_id)
@@ -76,28 +131,37 @@ class RecipeRepo:
         return recipe.scalar_one_or_none()
         # return recipe.unique().scalar_one_or_none()
 
-    async def popular_recipe(self, skip, limit) -> List[Recipe]:
+    async def recipe_ingredient_pairs(self) -> List[tuple]:
+        """(recipeId, ingredientId) for every recipe ingredient, feeds the index"""
+        query = select(RecipeIngredient.recipeId, RecipeIngredient.ingredientId)
+        result = await self.db.execute(query)
+        return result.tuples().all()
+
+    async def popular_recipe(
+        self,
+        skip,
+        limit,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ) -> List[RecipeResponse | RecipeSummary]:
 
+        schema, columns = RECIPE_PROJECTIONS[fields]
         query = (
-            select(Recipe)
-            .join(Recipe.userFavoriteRecipes)
-            .group_by(Recipe.id)  # only group by Recipe.id
-            .order_by(desc(func.count(UserFavoriteRecipe.userId)))
-            .options(
-                selectinload(
-                    Recipe.category
-                ),  # load in separate query, no GROUP BY needed
-                selectinload(Recipe.area),  # same here
-                selectinload(Recipe.ingredients),
-            )
-            .offset(skip)
-            .limit(limit)
+            select(*columns)
+            .where(Recipe.favorites_count > 0)
+            .order_by(desc(Recipe.favorites_count), desc(Recipe.id))
         )
+        if cursor:
+            # (favorites, id) strictly below the last row of the previous page
+            query = query.where(
+                tuple_(Recipe.favorites_count, Recipe.id) < tuple_(*cursor)
+            )
+        else:
+            query = query.offset(skip)
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await fetch_as(self.db, query.limit(limit), schema)
 
-    async def create_recipe(self, data: RecipeCreate, user: User) -> Recipe:
+    async def create_recipe(self, data: RecipeCreate, user: Principal) -> Recipe:
         recipe = Recipe(**data.model_dump(exclude_unset=True), ownerId=user.id)
         self.db.add(recipe)
         await self.db.commit()
@@ -105,7 +169,7 @@ class RecipeRepo:
         return await self.recipe_by_id(recipe.id)
 
     async def edit_recipe(
-        self, recipe_id: int, data: RecipeUpdate, user: User
+        self, recipe_id: int, data: RecipeUpdate, user: Principal
     ) -> Recipe:
         recipe = await self.recipe_by_id(recipe_id)
         if not recipe:
@@ -118,40 +182,74 @@ class RecipeRepo:
             setattr(recipe, key, value)
 
         await self.db.commit()
+        await recipe_cache.invalidate(recipe_id)
         await self.db.refresh(recipe)
 
         return recipe
 
-    async def delete_recipe(self, recipe_id: int, user: User) -> Recipe | None:
+    async def delete_recipe(
+        self, recipe_id: int, user: Principal
+    ) -> RecipeResponse | None:
         recipe = await self.recipe_by_id(recipe_id)
 
         if recipe is None or recipe.ownerId != user.id:
             return None
 
-        await self.db.delete(recipe_id)
+        # snapshot before the row is gone, the ORM object expires on commit
+        removed = RecipeResponse.model_validate(recipe)
+        for query in (
+            delete(RecipeIngredient).where(RecipeIngredient.recipeId == recipe_id),
+            delete(UserFavoriteRecipe).where(UserFavoriteRecipe.recipeId == recipe_id),
+            delete(Recipe).where(Recipe.id == recipe_id),
+        ):
+            await self.db.execute(query)
         await self.db.commit()
+        ingredient_index.remove_recipe(recipe_id)
+        await recipe_cache.invalidate(recipe_id)
 
-        return recipe
+        return removed
 
-    async def get_own_recipies(self, skip: int, limit: int, user: User) -> List[Recipe]:
+    async def get_own_recipies(
+        self,
+        skip: int,
+        limit: int,
+        user: Principal,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ) -> List[RecipeResponse | RecipeSummary]:
+        schema, columns = RECIPE_PROJECTIONS[fields]
         query = (
-            select(Recipe).where(Recipe.ownerId == user.id).offset(skip).limit(limit)
+            select(*columns)
+            .where(Recipe.ownerId == user.id)
+            .order_by(Recipe.id)
         )
-        recipies = await self.db.execute(query)
-        return recipies.scalars().all()
+        if cursor:
+            query = query.where(Recipe.id > cursor[0])
+        else:
+            query = query.offset(skip)
 
-    async def add_favorite(self, recipe_id: int, user: User) -> Recipe | None:
+        return await fetch_as(self.db, query.limit(limit), schema)
+
+    async def add_favorite(self, recipe_id: int, user: Principal) -> Recipe | None:
 
         query = insert(UserFavoriteRecipe).values(
             recipeId=recipe_id,
             userId=user.id,
         )
 
-        await self.db.execute(query)
+        try:
+            await self.db.execute(query)
+        except IntegrityError:
+            # already a favorite (or no such recipe): the counter stays as is
+            await self.db.rollback()
+            return await self.recipe_by_id(recipe_id)
+
+        await self.db.execute(self._bump_favorites(recipe_id, 1))
         await self.db.commit()
+        await recipe_cache.invalidate(recipe_id)  # favorites_count changed
         return await self.recipe_by_id(recipe_id)
 
-    async def remove_favorite(self, recipe_id: int, user: User) -> bool:
+    async def remove_favorite(self, recipe_id: int, user: Principal) -> bool:
 
         query = delete(UserFavoriteRecipe).where(
             UserFavoriteRecipe.recipeId == recipe_id,
@@ -159,19 +257,61 @@ class RecipeRepo:
         )
 
         result = await self.db.execute(query)
+        removed = result.rowcount > 0
+        if removed:
+            await self.db.execute(self._bump_favorites(recipe_id, -1))
         await self.db.commit()
+        if removed:
+            await recipe_cache.invalidate(recipe_id)
 
-        return result.rowcount > 0
+        return removed
 
-    async def get_my_favorite(self, skip: int, limit: int, user: User) -> List[Recipe]:
+    @staticmethod
+    def _bump_favorites(recipe_id: int, delta: int):
+        return (
+            update(Recipe)
+            .where(Recipe.id == recipe_id)
+            .values(favorites_count=Recipe.favorites_count + delta)
+        )
 
+    async def reconcile_favorites_count(self) -> int:
+        """Recount favorites_count from userFavoriteRecipes, return rows fixed."""
+        actual = (
+            select(func.count(UserFavoriteRecipe.userId))
+            .where(UserFavoriteRecipe.recipeId == Recipe.id)
+            .scalar_subquery()
+        )
         query = (
-            select(Recipe)
+            update(Recipe)
+            .where(Recipe.favorites_count != actual)
+            .values(favorites_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount
+
+    async def get_my_favorite(
+        self,
+        skip: int,
+        limit: int,
+        user: Principal,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ) -> List[RecipeResponse | RecipeSummary]:
+
+        schema, columns = RECIPE_PROJECTIONS[fields]
+        # ordering on the (userId, recipeId) primary key keeps pages index-ordered
+        query = (
+            select(*columns)
             .join(UserFavoriteRecipe, Recipe.id == UserFavoriteRecipe.recipeId)
             .where(UserFavoriteRecipe.userId == user.id)
-            .offset(skip)
-            .limit(limit)
+            .order_by(UserFavoriteRecipe.recipeId)
         )
+        if cursor:
+            query = query.where(UserFavoriteRecipe.recipeId > cursor[0])
+        else:
+            query = query.offset(skip)
 
-        recipies = await self.db.execute(query)
-        return recipies.scalars().all()
+        return await fetch_as(self.db, query.limit(limit), schema)
@@ -0,0 +1,75 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import ColumnElement, and_, literal_column, or_, func, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from src.database.recipe_models import Recipe, RecipeIngredient
+from src.database.taxonomy_models import Area, Category
+from src.database.ingredient_models import Ingredient
+
+TS_CONFIG = literal_column("'english'::regconfig")
+
+# Stored generated column + GIN index, Postgres only (see migration
+# f1a9d3c7b254), so it is not mapped on the model and SQLite create_all
+# keeps working.
+SEARCH_VECTOR = literal_column("recipes.search_vector", TSVECTOR)
+
+LIKE_ESCAPE = "\\"
+
+
+def contains(term: str) -> str:
+    """ILIKE pattern matching `term` literally, with % and _ escaped."""
+    escaped = (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+    return f"%{escaped}%"
+
+
+def text_search(
+    dialect: str, q: str
+) -> Tuple[ColumnElement, Optional[ColumnElement]]:
+    """Return (filter, rank) for the free-text query.
+
+    Postgres filters and ranks against the stored search_vector column, so
+    ts_rank_cd does not re-run to_tsvector per row; anything else (SQLite in
+    tests) gets a per-word ILIKE fallback without rank.
+    """
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery(TS_CONFIG, q)
+        return SEARCH_VECTOR.op("@@")(query), func.ts_rank_cd(SEARCH_VECTOR, query)
+
+    words = []
+    for word in q.split():
+        pattern = contains(word)
+        words.append(
+            or_(
+                Recipe.title.ilike(pattern, escape=LIKE_ESCAPE),
+                Recipe.description.ilike(pattern, escape=LIKE_ESCAPE),
+                Recipe.instructions.ilike(pattern, escape=LIKE_ESCAPE),
+            )
+        )
+    return and_(*words), None
+
+
+# The name filters resolve the small taxonomy tables first (trigram indexed on
+# Postgres) and then hit the recipes FK indexes, instead of a correlated EXISTS
+# evaluated for every recipe row.
+def category_filter(category: str) -> ColumnElement:
+    ids = select(Category.id).where(Category.name.ilike(contains(category), escape=LIKE_ESCAPE))
+    return Recipe.categoryId.in_(ids)
+
+
+def area_filter(area: str) -> ColumnElement:
+    ids = select(Area.id).where(Area.name.ilike(contains(area), escape=LIKE_ESCAPE))
+    return Recipe.areaId.in_(ids)
+
+
+def ingredient_filter(ingredient: str) -> ColumnElement:
+    recipe_ids = (
+        select(RecipeIngredient.recipeId)
+        .join(Ingredient, Ingredient.id == RecipeIngredient.ingredientId)
+        .where(Ingredient.name.ilike(contains(ingredient), escape=LIKE_ESCAPE))
+    )
+    return Recipe.id.in_(recipe_ids)
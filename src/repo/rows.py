@@ -0,0 +1,24 @@
+from typing import List, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+Schema = TypeVar("Schema", bound=BaseModel)
+
+
+def columns_for(model, schema: Type[BaseModel]) -> tuple:
+    """The model columns backing every field of a response schema"""
+    return tuple(getattr(model, field) for field in schema.model_fields)
+
+
+async def fetch_as(
+    db: AsyncSession, query: Select, schema: Type[Schema]
+) -> List[Schema]:
+    """Run a column select and build schemas straight from the rows.
+
+    No ORM instances are created, so nothing lands in the identity map and
+    unused columns are never read from the database.
+    """
+    result = await db.execute(query)
+    return [schema.model_validate(dict(row)) for row in result.mappings()]
@@ -3,6 +3,8 @@ from typing import List
 from sqlalchemy.future import select
 
 from src.database.user_models import Testimonial
+from src.schemas.user import TestimonialsResponse
+from src.repo.rows import columns_for, fetch_as
 
 
 class TestimonRepo:
@@ -10,9 +12,13 @@ class TestimonRepo:
     def __init__(self, session: AsyncSession):
         self.db = session
 
-    async def get_testimonials(self, skip, limit) -> List[Testimonial]:
+    async def get_testimonials(self, skip, limit) -> List[TestimonialsResponse]:
 
-        query = select(Testimonial).offset(skip).limit(limit)
+        query = (
+            select(*columns_for(Testimonial, TestimonialsResponse))
+            .order_by(Testimonial.id)
+            .offset(skip)
+            .limit(limit)
+        )
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await fetch_as(self.db, query, TestimonialsResponse)
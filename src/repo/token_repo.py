@@ -0,0 +1,40 @@
+from datetime import datetime, UTC
+from typing import Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.user_models import RefreshToken
+
+
+class RefreshTokenRepo:
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    async def add(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        # drop this user's expired sessions while we are here
+        await self.db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.userId == user_id,
+                RefreshToken.expires_at <= datetime.now(UTC),
+            )
+        )
+        await self.db.execute(
+            insert(RefreshToken).values(
+                jti=jti, userId=user_id, expires_at=expires_at
+            )
+        )
+        await self.db.commit()
+
+    async def pop(self, jti: str) -> Optional[int]:
+        # DELETE ... RETURNING: two concurrent refreshes can't both get the row
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.expires_at > datetime.now(UTC),
+            )
+            .returning(RefreshToken.userId)
+        )
+        await self.db.commit()
+        return result.scalar_one_or_none()
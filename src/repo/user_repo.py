@@ -4,7 +4,9 @@ from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from sqlalchemy.future import select
-from sqlalchemy import or_, insert, delete
+from sqlalchemy import or_, insert, delete, update
+from redis.exceptions import RedisError
+import logging
 
 from src.database.user_models import (
     User,
@@ -13,6 +15,18 @@ from src.database.user_models import (
     UserFollowers,
 )
 from src.schemas.user import UserCreate
+from src.database.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def invalidate_user_cache(username: str):
+    """Drop the cached user; if Redis is down the entry expires after USER_CACHE_TTL"""
+    key = f"user:{username}"
+    try:
+        await redis_manager.client.delete(key)
+    except RedisError as e:
+        logger.warning("Could not invalidate %s: %s", key, e)
 
 
 class UserRepo:
@@ -54,31 +68,35 @@ class UserRepo:
         return user
 
     async def update_user(self, user: User) -> User:
-        from src.services import auth_service
-
         self.db.add(user)
-        await self.db.commit()
         username = user.name
-        auth_service.red.delete(f"user:{username}")
+        await self.db.commit()
+        await invalidate_user_cache(username)
         await self.db.refresh(user)
         return user
 
     async def update_avatar_url(self, email: str, avatar_url: str) -> User:
-        from src.services import auth_service
-
         user = await self.get_user_by_email(email)
         user.avatar = avatar_url
-        await self.db.commit()
         username = user.name
-        auth_service.red.delete(f"user:{username}")
+        await self.db.commit()
+        await invalidate_user_cache(username)
         await self.db.refresh(user)
 
         return user
 
-    async def user_logout(self, user: User) -> None:
-        user.refresh_token = None
+    async def set_default_avatar(self, user_id: int, avatar_url: str) -> None:
+        # only fills an empty avatar, never overwrites an upload
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.avatar.is_(None))
+            .values(avatar=avatar_url)
+            .returning(User.name)
+        )
+        username = result.scalar_one_or_none()
         await self.db.commit()
-        await self.db.refresh(user)
+        if username is not None:
+            await invalidate_user_cache(username)
 
     async def get_user_following(self, user_id, skip, limit) -> List[User]:
         query = (
@@ -1,5 +1,8 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Literal, Optional
+
+# ?fields= on the recipe list endpoints
+RecipeFields = Literal["summary", "full"]
 
 
 class RecipeBase(BaseModel):
@@ -26,5 +29,31 @@ class RecipeResponse(RecipeBase):
     ownerId: int
     categoryId: int
     areaId: int
+    favorites_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RecipeSummary(BaseModel):
+    """Card-sized recipe for list pages, without the long text columns"""
+
+    id: int
+    title: str
+    thumb: Optional[str] = None
+    ownerId: int
+    categoryId: int
+    areaId: int
+    favorites_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RecipeMatchResponse(RecipeResponse):
+    matched: int = 0
+    missing: int = 0
+    coverage: float = 0.0
+
+
+class RecipeBatchResponse(BaseModel):
+    items: List[RecipeResponse]
+    missing: List[int]
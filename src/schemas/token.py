@@ -9,3 +9,10 @@ class Token(BaseModel):
 
 class TokenRefreshRequest(BaseModel):
     refresh_token: str
+
+
+class Principal(BaseModel):
+    """The caller as described by the access token claims"""
+
+    id: int
+    name: str
@@ -1,5 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import settings
+from src.database.db import sessionmanager
 from src.repo.areas_repo import AreasRepo
+from src.services.cache import AsyncLRUCache
+from src.services.http_cache import JsonBody, json_body
+
+areas_cache = AsyncLRUCache(
+    "areas", settings.TAXONOMY_CACHE_SIZE, settings.TAXONOMY_CACHE_TTL
+)
 
 
 class AreaService:
@@ -8,3 +17,16 @@ class AreaService:
 
     async def get_areas(self, skip: int, limit: int):
         return await self.areas_repo.get_areas(skip, limit)
+
+    async def get_areas_json(self, skip: int, limit: int) -> JsonBody:
+        """Serialized page with its ETag, cached per (skip, limit)"""
+        return await areas_cache.get_or_load(
+            (skip, limit), lambda: self._render(skip, limit)
+        )
+
+    @staticmethod
+    async def _render(skip: int, limit: int) -> JsonBody:
+        # shared by every coalesced caller and may outlive the first one's
+        # request, so it gets its own session instead of that request's
+        async with sessionmanager.session(readonly=True) as db:
+            return json_body(await AreasRepo(db).get_areas(skip, limit))
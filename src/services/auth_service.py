@@ -3,7 +3,7 @@ from typing import Optional, Literal
 
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 
@@ -11,17 +11,31 @@ from src.config.config import settings
 from src.database.db import get_db
 from src.database.user_models import User as UserSQLAlchemy
 from src.schemas.user import UserOut
+from src.schemas.token import Principal
 from src.services.user_service import UserService
-import redis
+from src.database.redis_client import redis_manager
+from src.services.executors import BoundedExecutor
+from src.services.token_store import RefreshTokenStore
+from src.services.cache import LRUCache
+from src.services.metrics import REDIS_LATENCY
+import hashlib
+import hmac
 import json
+import time
+from uuid import uuid4
 
+USER_CACHE_TTL = 300
 
-# Connecting to Redis
-red = redis.Redis(host="localhost", port=6379, db=0)
+# sha256(token) -> verified claims, each entry expiring with its token
+verified_tokens = LRUCache("jwt_claims", settings.JWT_CACHE_SIZE)
 
 
 class Hash:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # bcrypt releases the GIL, so a small thread pool keeps it off the event loop
+    pool = BoundedExecutor(
+        "bcrypt", settings.HASH_WORKERS, settings.HASH_MAX_PENDING
+    )
 
     def verify_pass(self, plain_pass, hashed_pass):
         return self.pwd_context.verify(plain_pass, hashed_pass)
@@ -29,6 +43,12 @@ class Hash:
     def get_pass_hash(self, password: str):
         return self.pwd_context.hash(password)
 
+    async def verify_pass_async(self, plain_pass, hashed_pass):
+        return await self.pool.run(self.verify_pass, plain_pass, hashed_pass)
+
+    async def get_pass_hash_async(self, password: str):
+        return await self.pool.run(self.get_pass_hash, password)
+
 
 oath2scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -63,32 +83,61 @@ async def create_refresh_token(data: dict, expires_delta: Optional[int] = None):
         refresh_token = await create_token(data, expires_delta, "refresh")
     else:
         refresh_token = await create_token(
-            data, timedelta(seconds=settings.REFRESH_TOKEN_EXPIRE_MINUTES), "refresh"
+            data, timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES), "refresh"
         )
     return refresh_token
 
 
-async def get_current_user(
-    token: str = Depends(oath2scheme), db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+def access_claims(user) -> dict:
+    """Claims for a new access token; uid/name let get_current_principal skip lookups"""
+    return {"sub": user.name, "uid": user.id, "name": user.name}
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def verify_jwt(token: str) -> dict:
+    """jwt.decode with a cache in front, raises JWTError like it.
+
+    Clients send the same access token on every request, so only the first
+    call pays for the signature and claim checks until the token expires.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(
+        token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+    )
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        verified_tokens.set(key, payload, ttl)
+    return payload
+
+
+def decode_access_token(token: str) -> dict:
     try:
-        # decode jwt
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        username = payload["sub"]
-        token_type: str = payload.get("token_type")
-        if username is None or token_type != "access":
-            raise credentials_exception
+        payload = verify_jwt(token)
     except JWTError as e:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None or payload.get("token_type") != "access":
+        raise credentials_exception()
+    return payload
+
 
-    user_cached = red.get(f"user:{username}")
+async def get_current_user(
+    token: str = Depends(oath2scheme), db: Session = Depends(get_db)
+):
+    username = decode_access_token(token)["sub"]
+
+    with REDIS_LATENCY.time(command="get"):
+        user_cached = await redis_manager.client.get(f"user:{username}")
     if user_cached:
         # If user is cached, load from cache and convert to User object
         user_data = json.loads(user_cached)
@@ -99,32 +148,77 @@ async def get_current_user(
     user = await user_service.get_user_by_username(username)
 
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
 
     user_schema = UserOut.model_validate(user)
-    red.set(f"user:{username}", user_schema.model_dump_json())
-    red.expire(f"user:{username}", 300)
+    with REDIS_LATENCY.time(command="set"):
+        await redis_manager.client.set(
+            f"user:{username}", user_schema.model_dump_json(), ex=USER_CACHE_TTL
+        )
 
     return user
 
 
-async def verify_refresh_token(refresh_token: str, db: Session):
+async def get_current_principal(
+    token: str = Depends(oath2scheme), db: Session = Depends(get_db)
+) -> Principal:
+    """Who is calling, straight from the token: no Redis or DB round trip.
+
+    For routes that only need the caller's id. Tokens issued before uid was
+    added fall back to the get_current_user lookup until they expire.
+    """
+    payload = decode_access_token(token)
+    if "uid" in payload:
+        return Principal(id=payload["uid"], name=payload.get("name", payload["sub"]))
+
+    user = await get_current_user(token, db)
+    return Principal(id=user.id, name=user.name)
+
+
+async def issue_refresh_token(user, store: RefreshTokenStore) -> str:
+    """New refresh token for a session of `user`, registered in the store"""
+    jti = uuid4().hex
+    expires_delta = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    refresh_token = await create_refresh_token(
+        {"sub": user.name, "uid": user.id, "jti": jti}, expires_delta
+    )
+    await store.add(jti, user.id, datetime.now(UTC) + expires_delta)
+    return refresh_token
+
+
+async def consume_refresh_token(
+    refresh_token: str, store: RefreshTokenStore
+) -> Optional[Principal]:
+    """Check a refresh token and retire it; a token works only once.
+
+    Tokens from before the store (no jti) are rejected, those sessions
+    have to log in again.
+    """
     try:
         payload = jwt.decode(
             refresh_token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-        username: str = payload["sub"]
-        token_type: str = payload["token_type"]
-        if username is None or token_type != "refresh":
-            return None
-        user_service = UserService(db)
-        user = await user_service.get_user_by_username(username)
-        stored_refresh_token = user.refresh_token
-
-        if stored_refresh_token != refresh_token:
-            return None
-
-        return user
-
     except JWTError:
         return None
+    if payload.get("token_type") != "refresh" or "jti" not in payload:
+        return None
+
+    user_id = await store.pop(payload["jti"])
+    if user_id is None or user_id != payload.get("uid"):
+        return None
+    return Principal(id=user_id, name=payload["sub"])
+
+
+def require_ops_token(request: Request):
+    """Guard for internal endpoints: 404 unless OPS_TOKEN is set and presented"""
+    if not settings.OPS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.OPS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid ops token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
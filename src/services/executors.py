@@ -0,0 +1,60 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a BoundedExecutor has no room left for another job."""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} executor is saturated")
+        self.name = name
+
+
+class BoundedExecutor:
+    """Dedicated thread pool with a hard cap on running + queued jobs.
+
+    Work beyond `max_pending` is rejected right away with ExecutorSaturated
+    (mapped to a 503 in main.py) instead of piling up behind slow jobs.
+    With processes=True the jobs run in a process pool, for CPU-bound work
+    that holds the GIL; `fn` and its arguments must then be picklable.
+    """
+
+    def __init__(
+        self, name: str, max_workers: int, max_pending: int, processes: bool = False
+    ):
+        self.name = name
+        self.max_pending = max(max_pending, max_workers)
+        if processes:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name
+            )
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn, *args, **kwargs):
+        # only touched from the event loop thread, no lock needed
+        if self._pending >= self.max_pending:
+            raise ExecutorSaturated(self.name)
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(fn, *args, **kwargs)
+            )
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
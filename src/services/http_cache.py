@@ -0,0 +1,60 @@
+import hashlib
+import json
+from typing import Any, NamedTuple
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from src.config.config import settings
+
+
+def make_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+class JsonBody(NamedTuple):
+    """A serialized response and its ETag, cached so hits skip the encoding"""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, body: bytes) -> "JsonBody":
+        return cls(body, make_etag(body))
+
+
+def json_body(content: Any) -> JsonBody:
+    return JsonBody.of(
+        json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison: W/"x" and "x" are the same representation
+    wanted = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in wanted
+
+
+def conditional_json(
+    request: Request, content: Any, max_age: int = settings.HTTP_CACHE_MAX_AGE
+) -> Response:
+    """JSON response with ETag/Cache-Control, or an empty 304 if the client has it.
+
+    `content` may already be a JsonBody (or serialized bytes), in which case
+    it is sent as is.
+    """
+    if isinstance(content, bytes):
+        content = JsonBody.of(content)
+    elif not isinstance(content, JsonBody):
+        content = json_body(content)
+
+    body, etag = content
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
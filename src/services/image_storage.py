@@ -0,0 +1,87 @@
+import hashlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+import cloudinary
+import cloudinary.uploader
+
+from src.config.config import settings
+from src.services.executors import BoundedExecutor
+from src.services.images import AVATAR_SIZE
+
+# blocking uploads and file writes get their own threads, so a slow storage
+# backend can't starve the default pool that to_thread and Starlette use
+upload_pool = BoundedExecutor(
+    "uploads", settings.UPLOAD_WORKERS, settings.UPLOAD_MAX_PENDING
+)
+
+
+class ImageStorage(ABC):
+    @abstractmethod
+    async def save_avatar(self, data: bytes, ext: str, owner: str) -> str:
+        """Store `owner`'s avatar, replacing the previous one; return its URL"""
+
+
+class CloudinaryStorage(ImageStorage):
+    def __init__(self, cloud_name, api_key, api_secret):
+        # once per process, not per request
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+
+    async def save_avatar(self, data: bytes, ext: str, owner: str) -> str:
+        public_id = f"RestApp/{owner}"
+        r = await upload_pool.run(
+            cloudinary.uploader.upload,
+            BytesIO(data),
+            public_id=public_id,
+            overwrite=True,
+        )
+        return cloudinary.CloudinaryImage(public_id).build_url(
+            width=AVATAR_SIZE[0],
+            height=AVATAR_SIZE[1],
+            crop="fill",
+            version=r.get("version"),
+        )
+
+
+class LocalStorage(ImageStorage):
+    """Files under `root`, served by main.py at `base_url`.
+
+    For local runs and benchmarks; stands in for an S3-style bucket.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    async def save_avatar(self, data: bytes, ext: str, owner: str) -> str:
+        # usernames are free text, never let them near a path
+        stem = hashlib.sha256(owner.encode()).hexdigest()[:24]
+        name = await upload_pool.run(self._write, f"avatars/{stem}", ext, data)
+        version = hashlib.sha256(data).hexdigest()[:12]
+        return f"{self.base_url}/{name}?v={version}"
+
+    def _write(self, stem: str, ext: str, data: bytes) -> str:
+        path = self.root / f"{stem}.{ext}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for old in path.parent.glob(f"{path.stem}.*"):
+            old.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return f"{stem}.{ext}"
+
+
+@lru_cache
+def get_image_storage() -> ImageStorage:
+    if settings.AVATAR_STORAGE == "local":
+        return LocalStorage(settings.AVATAR_LOCAL_DIR, settings.AVATAR_LOCAL_URL)
+    return CloudinaryStorage(
+        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
+    )
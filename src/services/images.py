@@ -0,0 +1,53 @@
+"""Image helpers for uploads.
+
+Kept free of app imports: downscale() runs in worker processes, which only
+need to import this module.
+"""
+
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+AVATAR_SIZE = (250, 250)
+
+# leading bytes -> (extension, content type)
+SIGNATURES = (
+    (b"\xff\xd8\xff", ("jpg", "image/jpeg")),
+    (b"\x89PNG\r\n\x1a\n", ("png", "image/png")),
+    (b"GIF87a", ("gif", "image/gif")),
+    (b"GIF89a", ("gif", "image/gif")),
+)
+
+
+def sniff(head: bytes) -> Optional[Tuple[str, str]]:
+    """(extension, content type) from the magic bytes, None if not an image we take"""
+    for magic, kind in SIGNATURES:
+        if head.startswith(magic):
+            return kind
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    return None
+
+
+def downscale(data: bytes, size: Tuple[int, int] = AVATAR_SIZE) -> Tuple[bytes, str]:
+    """Center-crop and shrink to `size`, return (image bytes, extension).
+
+    Raises ValueError for data Pillow can't decode. Transparent images stay
+    PNG, everything else becomes JPEG.
+    """
+    try:
+        image = Image.open(BytesIO(data))
+        image.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(str(e)) from e
+
+    image = ImageOps.exif_transpose(image)
+    image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+
+    out = BytesIO()
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        image.convert("RGBA").save(out, "PNG", optimize=True)
+        return out.getvalue(), "png"
+    image.convert("RGB").save(out, "JPEG", quality=85, optimize=True)
+    return out.getvalue(), "jpg"
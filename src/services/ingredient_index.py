@@ -0,0 +1,104 @@
+import asyncio
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Awaitable, Callable, Iterable, List, Literal, NamedTuple, Tuple
+
+from src.config.config import settings
+
+MatchMode = Literal["all", "any", "missing"]
+
+
+class IngredientMatch(NamedTuple):
+    recipe_id: int
+    matched: int  # requested ingredients the recipe uses
+    missing: int  # recipe ingredients that were not requested
+
+    @property
+    def coverage(self) -> float:
+        total = self.matched + self.missing
+        return self.matched / total if total else 0.0
+
+
+class IngredientIndex:
+    """In-memory inverted index from Ingredient.id to sorted recipe ids.
+
+    Built from recipeIngredients on first use and rebuilt after `ttl` seconds
+    so writes from other workers show up; this process's own deletes are
+    applied at once through remove_recipe.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._postings: dict[int, array] = {}
+        self._recipes: dict[int, frozenset[int]] = {}
+        self._built_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._built_at is not None
+            and time.monotonic() - self._built_at < self.ttl
+        )
+
+    async def ensure_fresh(
+        self, load_pairs: Callable[[], Awaitable[Iterable[Tuple[int, int]]]]
+    ):
+        """Rebuild from (recipe_id, ingredient_id) pairs if the index is stale"""
+        if self.is_fresh:
+            return
+        async with self._lock:
+            if self.is_fresh:
+                return
+            self.build(await load_pairs())
+
+    def build(self, pairs: Iterable[Tuple[int, int]]):
+        recipes: dict[int, set[int]] = {}
+        for recipe_id, ingredient_id in pairs:
+            recipes.setdefault(recipe_id, set()).add(ingredient_id)
+
+        postings: dict[int, list[int]] = {}
+        for recipe_id in sorted(recipes):
+            for ingredient_id in recipes[recipe_id]:
+                postings.setdefault(ingredient_id, []).append(recipe_id)
+
+        self._postings = {ing: array("i", ids) for ing, ids in postings.items()}
+        self._recipes = {rid: frozenset(ings) for rid, ings in recipes.items()}
+        self._built_at = time.monotonic()
+
+    def remove_recipe(self, recipe_id: int):
+        for ingredient_id in self._recipes.pop(recipe_id, ()):
+            posting = self._postings[ingredient_id]
+            i = bisect_left(posting, recipe_id)
+            if i < len(posting) and posting[i] == recipe_id:
+                del posting[i]
+
+    def match(
+        self, ingredient_ids: Iterable[int], mode: MatchMode, max_missing: int = 0
+    ) -> List[IngredientMatch]:
+        """Recipes for the given ingredients, best coverage first.
+
+        all: uses every requested ingredient; any: uses at least one;
+        missing: needs at most `max_missing` ingredients beyond the requested.
+        """
+        wanted = set(ingredient_ids)
+        counts = Counter()
+        for ingredient_id in wanted:
+            counts.update(self._postings.get(ingredient_id, ()))
+
+        matches = []
+        for recipe_id, matched in counts.items():
+            missing = len(self._recipes[recipe_id]) - matched
+            if mode == "all" and matched < len(wanted):
+                continue
+            if mode == "missing" and missing > max_missing:
+                continue
+            matches.append(IngredientMatch(recipe_id, matched, missing))
+
+        matches.sort(key=lambda m: (-m.coverage, m.missing, -m.matched, m.recipe_id))
+        return matches
+
+
+ingredient_index = IngredientIndex(settings.INGREDIENT_INDEX_TTL)
@@ -1,5 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import settings
+from src.database.db import sessionmanager
 from src.repo.ingredients_repo import IngredRepo
+from src.services.cache import AsyncLRUCache
+from src.services.http_cache import JsonBody, json_body
+
+ingredients_cache = AsyncLRUCache(
+    "ingredients", settings.TAXONOMY_CACHE_SIZE, settings.TAXONOMY_CACHE_TTL
+)
 
 
 class IngredService:
@@ -9,3 +18,16 @@ class IngredService:
 
     async def get_ingredients(self, skip: int, limit: int):
         return await self.ingred_repo.get_ingredients(skip, limit)
+
+    async def get_ingredients_json(self, skip: int, limit: int) -> JsonBody:
+        """Serialized page with its ETag, cached per (skip, limit)"""
+        return await ingredients_cache.get_or_load(
+            (skip, limit), lambda: self._render(skip, limit)
+        )
+
+    @staticmethod
+    async def _render(skip: int, limit: int) -> JsonBody:
+        # shared by every coalesced caller and may outlive the first one's
+        # request, so it gets its own session instead of that request's
+        async with sessionmanager.session(readonly=True) as db:
+            return json_body(await IngredRepo(db).get_ingredients(skip, limit))
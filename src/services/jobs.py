@@ -0,0 +1,161 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.config.config import settings
+from src.database.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+# job name -> async handler(**args), filled by @job in src/services/tasks.py
+handlers: Dict[str, Callable[..., Awaitable[None]]] = {}
+
+
+def job(name: str):
+    """Register an async function as the handler of job `name`"""
+
+    def register(fn):
+        handlers[name] = fn
+        return fn
+
+    return register
+
+
+class RedisQueue:
+    """Jobs as JSON in a Redis list, retries parked in a sorted set by due time.
+
+    Any number of workers (processes or hosts) can consume the same queue.
+    """
+
+    def __init__(self, key: str = "jobs"):
+        self.key = key
+        self.delayed_key = f"{key}:delayed"
+        self.dead_key = f"{key}:dead"
+
+    @property
+    def client(self):
+        return redis_manager.client
+
+    async def push(self, payload: str):
+        await self.client.lpush(self.key, payload)
+
+    async def push_later(self, payload: str, delay: float):
+        await self.client.zadd(self.delayed_key, {payload: time.time() + delay})
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        await self._promote_due()
+        item = await self.client.brpop([self.key], timeout=timeout)
+        return item[1] if item else None
+
+    async def _promote_due(self):
+        due = await self.client.zrangebyscore(self.delayed_key, 0, time.time())
+        for payload in due:
+            # ZREM decides which worker gets to move it
+            if await self.client.zrem(self.delayed_key, payload):
+                await self.push(payload)
+
+    async def bury(self, payload: str):
+        await self.client.lpush(self.dead_key, payload)
+        await self.client.ltrim(self.dead_key, 0, settings.JOB_DEAD_LETTERS - 1)
+
+
+class MemoryQueue:
+    """Process-local queue for REDIS_BACKEND=memory; the app's own worker drains it"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self.dead: deque[str] = deque(maxlen=settings.JOB_DEAD_LETTERS)
+
+    async def push(self, payload: str):
+        self._queue.put_nowait(payload)
+
+    async def push_later(self, payload: str, delay: float):
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, payload)
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def bury(self, payload: str):
+        self.dead.append(payload)
+
+
+job_queue = MemoryQueue() if settings.REDIS_BACKEND == "memory" else RedisQueue()
+
+
+async def enqueue(name: str, **args) -> str:
+    """Queue job `name`; args must be JSON serializable. Returns the job id."""
+    job_id = uuid.uuid4().hex
+    payload = {"id": job_id, "name": name, "args": args, "attempt": 0}
+    await job_queue.push(json.dumps(payload))
+    return job_id
+
+
+class Worker:
+    """Runs queued jobs, retrying failures with exponential backoff.
+
+    A job is tried JOB_MAX_ATTEMPTS times, JOB_BACKOFF_BASE ** attempt
+    seconds apart, then moved to the dead-letter list.
+    """
+
+    def __init__(self, queue=None, concurrency: int = settings.JOB_CONCURRENCY):
+        self.queue = queue or job_queue
+        self.concurrency = concurrency
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        self._tasks = [
+            asyncio.create_task(self._loop(), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        # loops notice within one poll interval and finish the job in hand
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_forever(self):
+        await self.start()
+        await asyncio.gather(*self._tasks)
+
+    async def _loop(self):
+        while not self._stopping.is_set():
+            try:
+                payload = await self.queue.pop(timeout=1)
+            except Exception as e:
+                logger.warning("Job queue unavailable: %s", e)
+                await asyncio.sleep(1)
+                continue
+            if payload is not None:
+                await self.run_job(payload)
+
+    async def run_job(self, payload: str):
+        item = json.loads(payload)
+        handler = handlers.get(item["name"])
+        if handler is None:
+            logger.error("No handler for job %s (%s)", item["name"], item["id"])
+            await self.queue.bury(payload)
+            return
+
+        try:
+            await handler(**item["args"])
+        except Exception as e:
+            item["attempt"] += 1
+            if item["attempt"] >= settings.JOB_MAX_ATTEMPTS:
+                logger.error("Job %s %s failed for good: %s", item["name"], item["id"], e)
+                await self.queue.bury(json.dumps(item))
+                return
+            delay = settings.JOB_BACKOFF_BASE ** item["attempt"]
+            logger.warning(
+                "Job %s %s failed (attempt %s), retrying in %ss: %s",
+                item["name"], item["id"], item["attempt"], delay, e,
+            )
+            await self.queue.push_later(json.dumps(item), delay)
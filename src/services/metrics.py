@@ -0,0 +1,236 @@
+"""Prometheus text-format metrics, kept in process memory.
+
+Written by hand instead of pulling in prometheus_client: the app needs a
+handful of counters and histograms and one exposition function. Values are
+per worker process, so scrape each worker (or run one per container).
+"""
+
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.db import sessionmanager
+from src.services.cache import cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+registry: List["Metric"] = []
+# extra text blocks computed at scrape time (cache stats, pools)
+collectors: List[Callable[[], Iterable[str]]] = []
+
+
+def _labels(names: Sequence[str], values: Sequence[str], **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        registry.append(self)
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {value}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _labels(self.labelnames, key, le=bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _labels(self.labelnames, key, le="+Inf")
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {self._sums[key]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in registry:
+        lines.extend(metric.render())
+    for collect in collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter(
+    "http_requests_total", "Requests served", ("method", "route", "status")
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency", ("method", "route")
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served")
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements per request",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL per request",
+    ("method", "route"),
+    buckets=FAST_BUCKETS,
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", buckets=FAST_BUCKETS
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis latency of the auth user cache",
+    ("command",),
+    buckets=FAST_BUCKETS,
+)
+
+
+@dataclass
+class RequestStats:
+    """SQL work done on behalf of the current request"""
+
+    queries: int = 0
+    db_time: float = 0.0
+
+
+# set by the metrics middleware; the engine hooks add to it
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Time every statement and charge it to the current request"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        QUERY_LATENCY.observe(elapsed)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+
+def route_template(scope: dict) -> str:
+    """'/api/recipe/{recipe_id:int}' rather than the raw path, to keep labels bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def observe_request(
+    method: str, route: str, status: int, elapsed: float, stats: RequestStats
+):
+    REQUESTS.inc(method=method, route=route, status=status)
+    REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+    REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+    REQUEST_DB_TIME.observe(stats.db_time, method=method, route=route)
+
+
+def cache_metrics() -> List[str]:
+    stats = cache_stats()
+    lines = []
+    for metric, kind, field, help in (
+        ("cache_hits_total", "counter", "hits", "In-process cache hits"),
+        ("cache_misses_total", "counter", "misses", "In-process cache misses"),
+        ("cache_hit_ratio", "gauge", "hit_ratio", "Hits over lookups since start"),
+    ):
+        lines += [f"# HELP {metric} {help}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{name}"}} {s[field]}' for name, s in stats.items()]
+    return lines
+
+
+def pool_metrics() -> List[str]:
+    status = sessionmanager.pool_status()
+    if "checked_out" not in status:
+        return []
+    return [
+        "# HELP db_pool_checked_out Primary pool connections in use",
+        "# TYPE db_pool_checked_out gauge",
+        f"db_pool_checked_out {status['checked_out']}",
+    ]
+
+
+collectors += [cache_metrics, pool_metrics]
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row of a page into an opaque token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Unpack a token made by `encode_cursor`, 400 on anything tampered with.
+
+    Every sort key the API pages by is an integer, so anything else is
+    rejected here rather than reaching the SQL comparison.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        # bool is an int subclass, but never a sort key
+        or not all(type(value) is int for value in values)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return values
+
+
+def next_cursor(
+    items: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]
+) -> Optional[str]:
+    """Cursor pointing after the last item, or None when the page is the last one."""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(*key(items[-1]))
@@ -0,0 +1,85 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Query-Profile"
+
+
+@dataclass
+class QueryProfile:
+    """Every statement a request ran, for spotting N+1 loops and slow SQL"""
+
+    statements: Counter = field(default_factory=Counter)
+    db_time: float = 0.0
+    slow: List[Tuple[float, str]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statements run often enough to look like a per-row query loop"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= settings.QUERY_REPEAT_THRESHOLD
+        ]
+
+    def header(self) -> str:
+        return (
+            f"queries={self.total}; db_ms={self.db_time * 1000:.1f}; "
+            f"repeated={len(self.repeated())}; slow={len(self.slow)}"
+        )
+
+
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+        profile = current_profile.get()
+        if profile is None:
+            return
+        # bound parameters are not part of the text, so the same query for
+        # different rows counts as a repeat
+        profile.statements[statement] += 1
+        profile.db_time += elapsed
+        if elapsed * 1000 >= settings.QUERY_SLOW_MS:
+            profile.slow.append((elapsed, statement))
+
+
+def _short(statement: str, width: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= width else statement[:width] + "..."
+
+
+def report(method: str, route: str, name: Optional[str], profile: QueryProfile):
+    """Log what looks wrong with the request's SQL"""
+    where = f"{method} {route}" + (f" ({name})" if name else "")
+    for statement, count in profile.repeated():
+        logger.warning("N+1 suspect on %s: %sx %s", where, count, _short(statement))
+    for elapsed, statement in profile.slow:
+        logger.warning(
+            "Slow query on %s: %.1f ms %s", where, elapsed * 1000, _short(statement)
+        )
+    logger.info("Queries on %s: %s", where, profile.header())
@@ -0,0 +1,47 @@
+from fastapi import Request
+from jose import JWTError
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from src.config.config import settings
+from src.services.auth_service import verify_jwt
+
+
+def storage_uri() -> str:
+    """Where the counters live: shared Redis unless configured otherwise"""
+    if settings.RATE_LIMIT_STORAGE_URI:
+        return settings.RATE_LIMIT_STORAGE_URI
+    if settings.REDIS_BACKEND == "memory":
+        return "memory://"
+    return f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
+
+
+def rate_limit_key(request: Request) -> str:
+    """Bucket per user for authenticated calls, per client IP otherwise.
+
+    Only a token with a valid signature names the bucket, so clients can't
+    dodge their limit by sending made-up subjects.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = verify_jwt(token)
+        except JWTError:
+            payload = {}
+        if payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+# One limiter for every router. The sliding-window-counter strategy runs as a
+# single Lua script on Redis, so a check is one atomic round trip; when Redis
+# is unreachable the limits fall back to per-process memory instead of 500s.
+limiter = Limiter(
+    key_func=rate_limit_key,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    storage_uri=storage_uri(),
+    storage_options={"socket_timeout": settings.REDIS_POOL_TIMEOUT},
+    in_memory_fallback_enabled=True,
+    key_prefix="ratelimit",
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
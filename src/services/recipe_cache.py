@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from src.config.config import settings
+from src.database.redis_client import redis_manager
+from src.schemas.recipe import RecipeResponse
+from src.services.cache import AsyncLRUCache
+from src.services.http_cache import JsonBody
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL = 5  # seconds a rebuild may hold the lock
+LOCK_WAIT = 0.05  # seconds between polls while another worker rebuilds
+LOCK_POLLS = 20
+
+
+class RecipeCache:
+    """Serialized RecipeResponse bodies: per-process L1 in front of Redis.
+
+    The L1 coalesces concurrent misses inside a worker; a short-lived Redis
+    lock makes sure only one worker rebuilds an invalidated hot recipe while
+    the others wait for its result instead of all hitting Postgres.
+
+    Bodies are stored under the recipe's current version, which invalidate()
+    bumps. A rebuild that read the row before a write then lands under the
+    old version, where no reader looks, instead of overwriting fresh data.
+    """
+
+    def __init__(self, ttl: int, l1_size: int, l1_ttl: int):
+        self.ttl = ttl
+        self.l1 = AsyncLRUCache("recipe_detail", l1_size, l1_ttl)
+
+    @staticmethod
+    def key(recipe_id: int) -> str:
+        return f"recipe:{recipe_id}"
+
+    @classmethod
+    def version_key(cls, recipe_id: int) -> str:
+        # no expiry: losing it would bring old versions back into view
+        return f"{cls.key(recipe_id)}:version"
+
+    async def get(
+        self,
+        recipe_id: int,
+        loader: Callable[[], Awaitable[Optional[RecipeResponse]]],
+    ) -> Optional[JsonBody]:
+        return await self.l1.get_or_load(
+            recipe_id, lambda: self._load_l1(recipe_id, loader)
+        )
+
+    async def _load_l1(self, recipe_id: int, loader) -> Optional[JsonBody]:
+        # the L1 keeps the ETag too, so hits don't hash the body again
+        body = await self._load(recipe_id, loader)
+        return JsonBody.of(body) if body is not None else None
+
+    async def _load(self, recipe_id: int, loader) -> Optional[bytes]:
+        redis = redis_manager.client
+        key = self.key(recipe_id)
+        try:
+            # read before the DB load, so a write after it changes the key
+            version = int(await redis.get(self.version_key(recipe_id)) or 0)
+            key = f"{key}:v{version}"
+            body = await redis.get(key)
+            if body is not None:
+                return body
+
+            lock = f"{key}:lock"
+            if await redis.set(lock, "1", ex=LOCK_TTL, nx=True):
+                try:
+                    return await self._fill(key, loader)
+                finally:
+                    await redis.delete(lock)
+
+            for _ in range(LOCK_POLLS):
+                await asyncio.sleep(LOCK_WAIT)
+                body = await redis.get(key)
+                if body is not None:
+                    return body
+        except RedisError as e:
+            logger.warning("Recipe cache unavailable, reading %s from DB: %s", key, e)
+
+        # lock holder is too slow or Redis is down: serve straight from the DB
+        return await self._render(loader)
+
+    async def _fill(self, key: str, loader) -> Optional[bytes]:
+        body = await self._render(loader)
+        if body is not None:
+            await redis_manager.client.set(key, body, ex=self.ttl)
+        return body
+
+    @staticmethod
+    async def _render(loader) -> Optional[bytes]:
+        recipe = await loader()
+        if recipe is None:
+            return None
+        return recipe.model_dump_json().encode()
+
+    async def invalidate(self, recipe_id: int):
+        # other workers' L1 copies age out after RECIPE_CACHE_L1_TTL
+        self.l1.invalidate(recipe_id)
+        try:
+            # the old version's body expires on its own
+            await redis_manager.client.incr(self.version_key(recipe_id))
+        except RedisError as e:
+            logger.warning("Could not invalidate recipe %s: %s", recipe_id, e)
+
+
+recipe_cache = RecipeCache(
+    settings.RECIPE_CACHE_TTL,
+    settings.RECIPE_CACHE_L1_SIZE,
+    settings.RECIPE_CACHE_L1_TTL,
+)
@@ -1,17 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.db import sessionmanager
 from src.repo.recipe_repo import RecipeRepo
-from typing import Optional
+from typing import List, Optional
 
-from src.schemas.recipe import RecipeCreate, RecipeUpdate
-from src.database.user_models import User
+from src.schemas.recipe import (
+    RecipeCreate,
+    RecipeUpdate,
+    RecipeMatchResponse,
+    RecipeBatchResponse,
+    RecipeFields,
+    RecipeResponse,
+)
+from src.schemas.token import Principal
+from src.services.http_cache import JsonBody
+from src.services.ingredient_index import ingredient_index, MatchMode
+from src.services.recipe_cache import recipe_cache
 
 
 class RecipeService:
     def __init__(self, db: AsyncSession):
         self.recipe_repo = RecipeRepo(db)
 
-    async def get_all_recipes(self, skip: int, limit: int):
-        return await self.recipe_repo.get_all_recipes(skip, limit)
+    async def get_all_recipes(
+        self,
+        skip: int,
+        limit: int,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ):
+        return await self.recipe_repo.get_all_recipes(skip, limit, cursor, fields)
 
     async def search_recipes(
         self,
@@ -20,34 +37,105 @@ class RecipeService:
         area: Optional[str],
         skip: int,
         limit: int,
+        q: Optional[str] = None,
     ):
         return await self.recipe_repo.search_recipes(
-            category, ingredient, area, skip, limit
+            category, ingredient, area, skip, limit, q
         )
 
-    async def search_by_id(self, recipe_id: int):
-        return await self.recipe_repo.recipe_by_id(recipe_id)
+    async def match_by_ingredients(
+        self,
+        ingredient_ids: List[int],
+        mode: MatchMode,
+        max_missing: int,
+        skip: int,
+        limit: int,
+    ) -> List[RecipeMatchResponse]:
+        await ingredient_index.ensure_fresh(self.recipe_repo.recipe_ingredient_pairs)
+        page = ingredient_index.match(ingredient_ids, mode, max_missing)[
+            skip : skip + limit
+        ]
+
+        recipes = await self.recipe_repo.recipes_by_ids([m.recipe_id for m in page])
+        by_id = {recipe.id: recipe for recipe in recipes}
+        return [
+            RecipeMatchResponse.model_validate(by_id[m.recipe_id]).model_copy(
+                update={
+                    "matched": m.matched,
+                    "missing": m.missing,
+                    "coverage": round(m.coverage, 4),
+                }
+            )
+            for m in page
+            if m.recipe_id in by_id
+        ]
+
+    async def search_by_id_json(self, recipe_id: int) -> Optional[JsonBody]:
+        """Serialized RecipeResponse, served from the recipe cache"""
 
-    async def get_popular(self, skip: int, limit: int):
-        return await self.recipe_repo.popular_recipe(skip, limit)
+        # the cache shares this load with other callers and may outlive this
+        # request, so it gets its own session. Primary, not a replica: the
+        # fill often follows an invalidating write, and a lagging replica
+        # would put the old body back for RECIPE_CACHE_TTL
+        async def load() -> Optional[RecipeResponse]:
+            async with sessionmanager.session() as db:
+                recipe = await RecipeRepo(db).recipe_by_id(recipe_id)
+                return RecipeResponse.model_validate(recipe) if recipe else None
 
-    async def create_recipe(self, data: RecipeCreate, user: User):
+        return await recipe_cache.get(recipe_id, load)
+
+    async def get_batch(self, recipe_ids: List[int]) -> RecipeBatchResponse:
+        ids = list(dict.fromkeys(recipe_ids))  # dedupe, keep request order
+        recipes = await self.recipe_repo.recipes_by_ids(ids)
+        found = {recipe.id for recipe in recipes}
+        return RecipeBatchResponse(
+            items=recipes, missing=[i for i in ids if i not in found]
+        )
+
+    async def get_popular(
+        self,
+        skip: int,
+        limit: int,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ):
+        return await self.recipe_repo.popular_recipe(skip, limit, cursor, fields)
+
+    async def create_recipe(self, data: RecipeCreate, user: Principal):
         return await self.recipe_repo.create_recipe(data, user)
 
-    async def edit_recipe(self, recipe_id: int, data: RecipeUpdate, user: User):
+    async def edit_recipe(self, recipe_id: int, data: RecipeUpdate, user: Principal):
         return await self.recipe_repo.edit_recipe(recipe_id, data, user)
 
-    async def delete_recipe(self, recipe_id: int, user: User):
+    async def delete_recipe(self, recipe_id: int, user: Principal):
         return await self.recipe_repo.delete_recipe(recipe_id, user)
 
-    async def get_own_recipies(self, skip: int, limit: int, user: User):
-        return await self.recipe_repo.get_own_recipies(skip, limit, user)
+    async def get_own_recipies(
+        self,
+        skip: int,
+        limit: int,
+        user: Principal,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ):
+        return await self.recipe_repo.get_own_recipies(
+            skip, limit, user, cursor, fields
+        )
 
-    async def add_favorite(self, recipe_id: int, user: User):
+    async def add_favorite(self, recipe_id: int, user: Principal):
         return await self.recipe_repo.add_favorite(recipe_id, user)
 
-    async def remove_favorite(self, recipe_id: int, user: User):
+    async def remove_favorite(self, recipe_id: int, user: Principal):
         return await self.recipe_repo.remove_favorite(recipe_id, user)
 
-    async def get_my_favorite(self, skip: int, limit: int, user: User):
-        return await self.recipe_repo.get_my_favorite(skip, limit, user)
+    async def get_my_favorite(
+        self,
+        skip: int,
+        limit: int,
+        user: Principal,
+        cursor: Optional[list] = None,
+        fields: RecipeFields = "full",
+    ):
+        return await self.recipe_repo.get_my_favorite(
+            skip, limit, user, cursor, fields
+        )
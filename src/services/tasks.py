@@ -0,0 +1,26 @@
+"""Job handlers. Imported by whatever runs a Worker (main.py, src/worker.py)."""
+
+from base64 import b64decode
+
+from libgravatar import Gravatar
+
+from src.database.db import sessionmanager
+from src.repo.user_repo import UserRepo
+from src.services.image_storage import get_image_storage
+from src.services.jobs import job
+
+
+@job("avatar.store")
+async def store_avatar(username: str, email: str, data: str, ext: str):
+    """Push an already validated avatar to storage and point the user at it"""
+    url = await get_image_storage().save_avatar(b64decode(data), ext, username)
+    async with sessionmanager.session() as db:
+        await UserRepo(db).update_avatar_url(email, url)
+
+
+@job("user.gravatar")
+async def fill_gravatar(user_id: int, email: str):
+    """Default avatar for a new user, unless they uploaded one meanwhile"""
+    avatar = Gravatar(email).get_image()
+    async with sessionmanager.session() as db:
+        await UserRepo(db).set_default_avatar(user_id, avatar)
@@ -1,5 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import settings
+from src.database.db import sessionmanager
 from src.repo.testimon_repo import TestimonRepo
+from src.services.cache import AsyncLRUCache
+from src.services.http_cache import JsonBody, json_body
+
+# testimonials only change through the seeder, the TTL covers reseeds
+testimonials_cache = AsyncLRUCache(
+    "testimonials", settings.TAXONOMY_CACHE_SIZE, settings.TAXONOMY_CACHE_TTL
+)
 
 
 class TestimonialService:
@@ -8,3 +18,16 @@ class TestimonialService:
 
     async def get_testimonials(self, skip: int, limit: int):
         return await self.testim_repo.get_testimonials(skip, limit)
+
+    async def get_testimonials_json(self, skip: int, limit: int) -> JsonBody:
+        """Serialized page with its ETag, cached per (skip, limit)"""
+        return await testimonials_cache.get_or_load(
+            (skip, limit), lambda: self._render(skip, limit)
+        )
+
+    @staticmethod
+    async def _render(skip: int, limit: int) -> JsonBody:
+        # shared by every coalesced caller and may outlive the first one's
+        # request, so it gets its own session instead of that request's
+        async with sessionmanager.session(readonly=True) as db:
+            return json_body(await TestimonRepo(db).get_testimonials(skip, limit))
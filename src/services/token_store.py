@@ -0,0 +1,55 @@
+import logging
+from datetime import datetime, UTC
+from typing import Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import settings
+from src.database.redis_client import redis_manager
+from src.repo.token_repo import RefreshTokenRepo
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenStore:
+    """Live refresh tokens by jti, one entry per session.
+
+    Entries go to Redis with a TTL matching the token's exp. With
+    REFRESH_TOKEN_STORE=db, or while Redis is unreachable, they go to the
+    refresh_tokens table instead, and pop() checks both. Entries are single
+    use: pop() is how a token gets rotated or revoked.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.repo = RefreshTokenRepo(db)
+
+    @staticmethod
+    def key(jti: str) -> str:
+        return f"refresh:{jti}"
+
+    @property
+    def use_redis(self) -> bool:
+        return settings.REFRESH_TOKEN_STORE == "redis"
+
+    async def add(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        if self.use_redis:
+            ttl = int((expires_at - datetime.now(UTC)).total_seconds())
+            try:
+                await redis_manager.client.set(self.key(jti), user_id, ex=max(ttl, 1))
+                return
+            except RedisError as e:
+                logger.warning("Token store unavailable, keeping session in DB: %s", e)
+        await self.repo.add(jti, user_id, expires_at)
+
+    async def pop(self, jti: str) -> Optional[int]:
+        """Remove a session and return its user id; None if unknown or used"""
+        if self.use_redis:
+            try:
+                user_id = await redis_manager.client.getdel(self.key(jti))
+                if user_id is not None:
+                    return int(user_id)
+            except RedisError as e:
+                logger.warning("Token store unavailable, checking session in DB: %s", e)
+        # tokens issued while Redis was down only exist in the table
+        return await self.repo.pop(jti)
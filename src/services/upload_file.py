@@ -1,34 +1,61 @@
-import cloudinary
-import cloudinary.uploader
-import asyncio
+from fastapi import HTTPException, UploadFile, status
+
+from src.config.config import settings
+from src.services.executors import BoundedExecutor
+from src.services.images import downscale, sniff
+
+CHUNK_SIZE = 64 * 1024
+
+# resizing is CPU-bound and holds the GIL, so it gets processes, not threads
+image_pool = BoundedExecutor(
+    "images", settings.IMAGE_WORKERS, settings.IMAGE_MAX_PENDING, processes=True
+)
 
 
 class UploadFileService:
-    def __init__(self, cloud_name, api_key, api_secret):
-        self.cloud_name = cloud_name
-        self.api_key = api_key
-        self.api_secret = api_secret
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
-        )
+    def __init__(self, max_bytes: int = settings.AVATAR_MAX_BYTES):
+        self.max_bytes = max_bytes
 
-    @staticmethod
-    async def upload_file(file, username) -> str:
-        public_id = f"RestApp/{username}"
-
-        # sync version
-        # r = cloudinary.uploader(file.file, public_id=public_id, overwrite=True)
-        r = await asyncio.to_thread(
-            cloudinary.uploader.upload,
-            file.file,
-            public_id=public_id,
-            overwrite=True,
-        )
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
+    async def read_image(self, file: UploadFile) -> bytes:
+        """Read the upload in chunks, return the validated bytes.
+
+        Fails fast: 413 as soon as the size cap is passed, 415 when the first
+        chunk doesn't look like an image.
+        """
+        if file.size is not None and file.size > self.max_bytes:
+            raise self.too_large()
+
+        head = await file.read(CHUNK_SIZE)
+        if sniff(head) is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Upload a JPEG, PNG, GIF or WebP image",
+            )
+
+        data = bytearray(head)
+        while chunk := await file.read(CHUNK_SIZE):
+            data += chunk
+            if len(data) > self.max_bytes:
+                raise self.too_large()
+        if len(data) > self.max_bytes:
+            raise self.too_large()
+        return bytes(data)
+
+    def too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"The image must be at most {self.max_bytes // 1024} KB",
         )
 
-        return src_url
+    async def prepare_avatar(self, file: UploadFile) -> tuple[bytes, str]:
+        """Validated avatar bytes, downscaled to AVATAR_SIZE"""
+        # downscale() picks the output format, the upload's doesn't matter
+        data = await self.read_image(file)
+
+        try:
+            return await image_pool.run(downscale, data)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="The image could not be decoded",
+            )
@@ -1,23 +1,19 @@
+import logging
+
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
-from libgravatar import Gravatar
 from src.schemas.user import UserCreate
 from src.repo.user_repo import UserRepo
 from src.database.user_models import User
+from src.services.jobs import enqueue
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
     def __init__(self, db: AsyncSession):
         self.repo = UserRepo(db)
 
-    async def user_create(self, body: UserCreate):
-        avatar: None
-        try:
-            g = Gravatar(body.email)
-            avatar = g.get_image()
-        except Exception as e:
-            print(e)
-        return await self.repo.create_user(body, avatar)
-
     async def get_user_by_id(self, user_id: str):
         return await self.repo.get_user_by_id(user_id)
 
@@ -31,13 +27,14 @@ class UserService:
         return await self.repo.get_user_by_email_name(email, name)
 
     async def create_user(self, body: UserCreate):
-        avatar: None
+        user = await self.repo.create_user(body)
+        # the Gravatar default is filled in by the job worker; the account is
+        # already committed, so a queue outage must not fail the signup
         try:
-            g = Gravatar(body.email)
-            avatar = g.get_image()
-        except Exception as e:
-            print(e)
-        return await self.repo.create_user(body, avatar)
+            await enqueue("user.gravatar", user_id=user.id, email=user.email)
+        except RedisError as e:
+            logger.warning("Could not queue the Gravatar for user %s: %s", user.id, e)
+        return user
 
     async def update_user(self, user: User):
         return await self.repo.update_user(user)
@@ -45,9 +42,6 @@ class UserService:
     async def update_avatar_url(self, email: str, avatar: str):
         return await self.repo.update_avatar_url(email, avatar)
 
-    async def user_logout(self, user):
-        return await self.repo.user_logout(user)
-
     async def get_user_following(self, user_id: int, skip: int, limit: int):
         return await self.repo.get_user_following(user_id, skip, limit)
 
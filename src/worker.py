@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from src.config.config import settings
+from src.database.db import sessionmanager
+from src.database.redis_client import redis_manager
+from src.services import tasks  # registers the job handlers
+from src.services.image_storage import upload_pool
+from src.services.jobs import MemoryQueue, Worker, handlers, job_queue
+from src.services.upload_file import image_pool
+
+
+async def main(concurrency: int):
+    if isinstance(job_queue, MemoryQueue):
+        print("❌ REDIS_BACKEND=memory: jobs run inside the app, nothing to do here")
+        return
+
+    worker = Worker(concurrency=concurrency)
+    await worker.start()
+    print(f"👷 Worker up: {concurrency} slots, jobs: {', '.join(sorted(handlers))}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    print("🛑 Finishing running jobs...")
+    await worker.stop()
+    await sessionmanager.close()
+    await redis_manager.close()
+    upload_pool.shutdown()
+    image_pool.shutdown()
+    print("✅ Worker stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_CONCURRENCY)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.concurrency))
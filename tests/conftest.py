@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+# settings are read when src is first imported; keep tests off real services
+os.environ["DB_URL"] = "sqlite+aiosqlite:///" + os.path.join(
+    tempfile.mkdtemp(prefix="foodies-tests-"), "test.db"
+)
+os.environ["REDIS_BACKEND"] = "memory"
+for name, value in (
+    ("JWT_SECRET", "test-secret"),
+    ("JWT_ALGORITHM", "HS256"),
+    ("ACCESS_TOKEN_EXPIRE_MINUTES", "30"),
+    ("REFRESH_TOKEN_EXPIRE_MINUTES", "600"),
+    ("CLD_NAME", "test"),
+    ("CLD_API_KEY", "0"),
+    ("CLD_API_SECRET", "test"),
+    ("SEED_USER_PASSWORD", "test123"),
+):
+    os.environ.setdefault(name, value)
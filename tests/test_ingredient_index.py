@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from src.services.ingredient_index import IngredientIndex
+
+# recipe id -> ingredient ids
+RECIPES = {
+    1: {10, 11},
+    2: {10, 11, 12},
+    3: {10},
+    4: {12, 13},
+    5: {11, 10},
+}
+
+
+def build(recipes=RECIPES, ttl: float = 60) -> IngredientIndex:
+    index = IngredientIndex(ttl)
+    index.build(
+        (recipe_id, ingredient_id)
+        for recipe_id, ingredients in recipes.items()
+        for ingredient_id in ingredients
+    )
+    return index
+
+
+def ids(matches):
+    return [m.recipe_id for m in matches]
+
+
+def test_all_needs_every_requested_ingredient():
+    assert ids(build().match([10, 11], "all")) == [1, 5, 2]
+
+
+def test_any_needs_one_requested_ingredient():
+    matches = build().match([10, 12], "any")
+    # best coverage first: 3 uses only 10, 2 uses two of its three
+    assert ids(matches) == [3, 2, 1, 4, 5]
+    by_id = {m.recipe_id: m for m in matches}
+    assert (by_id[2].matched, by_id[2].missing) == (2, 1)
+    assert (by_id[4].matched, by_id[4].missing) == (1, 1)
+
+
+def test_missing_caps_extra_ingredients():
+    index = build()
+    assert ids(index.match([10], "missing")) == [3]
+    assert ids(index.match([10], "missing", max_missing=1)) == [3, 1, 5]
+    assert ids(index.match([10], "missing", max_missing=2)) == [3, 1, 5, 2]
+
+
+def test_ties_rank_by_fewer_missing_then_more_matched_then_id():
+    index = build({7: {1, 2}, 3: {1, 2}, 5: {1, 2, 3, 4}, 4: {1, 3}})
+    # 3 and 7 are identical, so ids break the tie; 4 covers 50% like 5 but
+    # misses one ingredient instead of two
+    assert ids(index.match([1, 2], "any")) == [3, 7, 4, 5]
+
+
+def test_unknown_ingredients_match_nothing():
+    assert build().match([99], "any") == []
+    assert build().match([10, 99], "all") == []
+
+
+def test_coverage():
+    (match,) = build().match([12, 13], "all")
+    assert match.recipe_id == 4
+    assert match.coverage == 1.0
+
+
+def test_remove_recipe():
+    index = build()
+    index.remove_recipe(2)
+    assert ids(index.match([10, 11, 12], "any")) == [1, 5, 3, 4]
+    index.remove_recipe(2)  # already gone
+    index.remove_recipe(404)  # never indexed
+    assert 2 not in ids(index.match([12], "any"))
+
+
+def test_ensure_fresh_loads_once_within_ttl():
+    index = IngredientIndex(ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [(1, 10), (2, 10)]
+
+    async def run():
+        await asyncio.gather(*(index.ensure_fresh(load) for _ in range(5)))
+        await index.ensure_fresh(load)
+
+    asyncio.run(run())
+    assert len(loads) == 1
+    assert ids(index.match([10], "any")) == [1, 2]
+
+
+def test_ensure_fresh_rebuilds_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "src.services.ingredient_index.time.monotonic", lambda: now[0]
+    )
+    index = IngredientIndex(ttl=30)
+    snapshots = iter([[(1, 10)], [(1, 10), (2, 10)]])
+
+    async def load():
+        return next(snapshots)
+
+    asyncio.run(index.ensure_fresh(load))
+    assert ids(index.match([10], "any")) == [1]
+
+    now[0] += 29
+    asyncio.run(index.ensure_fresh(load))
+    assert ids(index.match([10], "any")) == [1]
+
+    now[0] += 2
+    assert not index.is_fresh
+    asyncio.run(index.ensure_fresh(load))
+    assert ids(index.match([10], "any")) == [1, 2]
+
+
+@pytest.mark.parametrize("mode", ["all", "any", "missing"])
+def test_empty_index(mode):
+    assert IngredientIndex(ttl=60).match([1], mode) == []
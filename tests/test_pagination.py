@@ -0,0 +1,49 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.parametrize("values", [(7,), (12, 345), (0, -1)])
+def test_round_trip(values):
+    assert decode_cursor(encode_cursor(*values), len(values)) == list(values)
+
+
+def test_missing_cursor_is_first_page():
+    assert decode_cursor(None, 1) is None
+    assert decode_cursor("", 2) is None
+
+
+@pytest.mark.parametrize(
+    "cursor, size",
+    [
+        ("not base64!", 1),
+        (base64.urlsafe_b64encode(b"{not json").decode(), 1),
+        (raw_cursor({"id": 1}), 1),
+        (raw_cursor([1, 2]), 1),
+        (raw_cursor([1]), 2),
+        (raw_cursor([{"a": 1}]), 1),
+        (raw_cursor(["a", "b"]), 2),
+        (raw_cursor([1.5]), 1),
+        (raw_cursor([True]), 1),
+        (raw_cursor([None, 3]), 2),
+    ],
+)
+def test_rejects_tampered_cursor(cursor, size):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, size)
+    assert error.value.status_code == 400
+
+
+def test_next_cursor_only_for_full_pages():
+    rows = [(1,), (2,), (3,)]
+    assert next_cursor(rows, 3, lambda r: r) == encode_cursor(3)
+    assert next_cursor(rows, 4, lambda r: r) is None
+    assert next_cursor([], 3, lambda r: r) is None
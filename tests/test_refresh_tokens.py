@@ -0,0 +1,129 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.api.auth import logout_user, new_token
+from src.config.config import settings
+from src.database.base import Base
+from src.database.db import DatabaseSessionManager
+from src.database.redis_client import InMemoryRedis, redis_manager
+from src.database.user_models import User
+from src.schemas.token import Principal, TokenRefreshRequest
+from src.services.auth_service import issue_refresh_token
+from src.services.token_store import RefreshTokenStore
+
+# the remaining models have to be registered before create_all
+import src.database.recipe_models  # noqa: F401
+import src.database.ingredient_models  # noqa: F401
+import src.database.taxonomy_models  # noqa: F401
+
+
+class DownRedis:
+    """Redis that is unreachable for every command"""
+
+    async def set(self, *args, **kwargs):
+        raise RedisConnectionError("connection refused")
+
+    async def getdel(self, *args, **kwargs):
+        raise RedisConnectionError("connection refused")
+
+
+@pytest.fixture(autouse=True)
+def redis_store(monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_TOKEN_STORE", "redis")
+    redis_manager.override(InMemoryRedis())
+    yield
+    redis_manager.override(None)
+
+
+def run(scenario):
+    """Run `scenario(db, user)` against a fresh user, in one event loop"""
+
+    async def main():
+        manager = DatabaseSessionManager(settings.DB_URL)
+        try:
+            async with manager._engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with manager.session() as db:
+                name = uuid4().hex[:12]
+                user = User(name=name, email=f"{name}@test.io", hashed_password="x")
+                db.add(user)
+                await db.flush()
+                # commits expire ORM objects, hand out plain claims instead
+                principal = Principal(id=user.id, name=name)
+                await db.commit()
+                await scenario(db, principal)
+        finally:
+            await manager.close()
+
+    asyncio.run(main())
+
+
+async def refresh(db, token: str) -> str:
+    tokens = await new_token(TokenRefreshRequest(refresh_token=token), db)
+    return tokens["refresh_token"]
+
+
+def test_refresh_rotates_and_rejects_reuse():
+    async def scenario(db, user):
+        token = await issue_refresh_token(user, RefreshTokenStore(db))
+        rotated = await refresh(db, token)
+        assert rotated != token
+
+        with pytest.raises(HTTPException) as error:
+            await refresh(db, token)
+        assert error.value.status_code == 401
+        # the rotated token is still good
+        await refresh(db, rotated)
+
+    run(scenario)
+
+
+def test_logout_revokes_only_its_own_session():
+    async def scenario(db, user):
+        store = RefreshTokenStore(db)
+        phone = await issue_refresh_token(user, store)
+        laptop = await issue_refresh_token(user, store)
+
+        assert await logout_user(refresh_token=phone, db=db) == {
+            "message": "Logged out successfully"
+        }
+        with pytest.raises(HTTPException) as error:
+            await refresh(db, phone)
+        assert error.value.status_code == 401
+        await refresh(db, laptop)
+
+    run(scenario)
+
+
+def test_token_issued_while_redis_down_is_kept_in_db():
+    async def scenario(db, user):
+        redis_manager.override(DownRedis())
+        token = await issue_refresh_token(user, RefreshTokenStore(db))
+
+        # Redis is back, but empty: the session is found in the table
+        redis_manager.override(InMemoryRedis())
+        rotated = await refresh(db, token)
+
+        with pytest.raises(HTTPException) as error:
+            await refresh(db, token)
+        assert error.value.status_code == 401
+        await refresh(db, rotated)
+
+    run(scenario)
+
+
+def test_redis_down_on_refresh_checks_db():
+    async def scenario(db, user):
+        redis_manager.override(DownRedis())
+        token = await issue_refresh_token(user, RefreshTokenStore(db))
+        rotated = await refresh(db, token)
+
+        with pytest.raises(HTTPException):
+            await refresh(db, token)
+        await refresh(db, rotated)
+
+    run(scenario)